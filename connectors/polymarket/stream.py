@@ -12,12 +12,12 @@ Docs / references:
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import time
 from collections.abc import Callable
 from typing import Any, Optional
 
+import orjson
 import websockets
 from websockets.exceptions import ConnectionClosed
 
@@ -195,19 +195,22 @@ class AsyncPolymarketStreamListener:
 
         # RTDS subscription format (see Polymarket real-time-data-client):
         # { "action": "subscribe", "subscriptions": [ { "topic": "rfq", "type": "*" } ] }
+        # Sent as a text frame (decoded) — orjson.dumps returns bytes, which websockets
+        # would otherwise send as a binary frame.
         msg = {"action": "subscribe", "subscriptions": [{"topic": "rfq", "type": "*"}]}
-        await self._ws.send(json.dumps(msg))
+        await self._ws.send(orjson.dumps(msg).decode())
         logger.info("[STREAMING] RTDS subscribe sent (topic=rfq, type=*)")
 
     async def _handle_raw_message(self, raw_msg: Any) -> None:
-        if raw_msg == "pong":
+        if raw_msg == "pong" or raw_msg == b"pong":
             logger.info("[STREAMING] RTDS pong received (connection alive)")
             return
-        if raw_msg == "ping":
+        if raw_msg == "ping" or raw_msg == b"ping":
             logger.debug("[STREAMING] RTDS ping received")
             return
 
-        if not isinstance(raw_msg, str):
+        # orjson parses bytes frames directly, so binary frames skip the UTF-8 decode.
+        if not isinstance(raw_msg, (str, bytes)):
             logger.debug("[STREAMING] RTDS non-text message: %r", raw_msg)
             return
 
@@ -219,8 +222,8 @@ class AsyncPolymarketStreamListener:
             logger.debug("[STREAMING] RTDS raw message: %s", raw_msg)
 
         try:
-            msg = json.loads(raw_msg)
-        except json.JSONDecodeError:
+            msg = orjson.loads(raw_msg)
+        except orjson.JSONDecodeError:
             logger.warning("[STREAMING] RTDS message not JSON (len=%d): %r", len(raw_msg), raw_msg[:200])
             return
 
@@ -11,11 +11,13 @@ To switch between modes:
 import asyncio
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from fastapi import FastAPI, HTTPException, Response
 
 import settings
 from connectors.betfair.client import BetfairClient
@@ -28,7 +30,24 @@ from connectors.polymarket.poll import AsyncPolymarketPollListener
 from pricing.quote_engine import QuoteEngine
 from utils.logging_config import setup_logging
 
-setup_logging(log_level=logging.INFO)
+# Number of uvicorn worker processes. Feeds and RFQ listeners are per-process state,
+# so with more than one worker only the process holding FEED_OWNER_LOCK runs them and
+# publishes their state to FEED_SNAPSHOT_PATH; the other workers serve reads from it.
+UVICORN_WORKERS = int(os.environ.get("UVICORN_WORKERS", "1"))
+FEED_OWNER_LOCK = os.environ.get("FEED_OWNER_LOCK", "/tmp/totem-mm.feed.lock")
+FEED_SNAPSHOT_PATH = os.environ.get("FEED_SNAPSHOT_PATH", "/tmp/totem-mm.snapshot.json")
+FEED_SNAPSHOT_INTERVAL = float(os.environ.get("FEED_SNAPSHOT_INTERVAL", "0.25"))
+# A snapshot older than this (owner gone or stuck) counts as no feed.
+FEED_SNAPSHOT_MAX_AGE = float(os.environ.get("FEED_SNAPSHOT_MAX_AGE", "5"))
+# How often non-owner workers retry FEED_OWNER_LOCK, to take over if the owner exits.
+FEED_OWNER_RETRY_INTERVAL = float(os.environ.get("FEED_OWNER_RETRY_INTERVAL", "1"))
+
+# Each worker rotates its own log file; rotating one shared file from several
+# processes renames it out from under the others.
+setup_logging(
+    log_level=logging.INFO,
+    log_file="totem-mm.log" if UVICORN_WORKERS <= 1 else f"totem-mm.{os.getpid()}.log",
+)
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +69,10 @@ BETFAIR_MARKET_IDS = [
 USE_BETFAIR_STREAMING = False    # Set to True for streaming mode
 USE_POLYMARKET_STREAMING = False  # Set to True for streaming mode
 
+BETFAIR_MODE = "streaming" if USE_BETFAIR_STREAMING else "polling"
+POLYMARKET_MODE = "streaming" if USE_POLYMARKET_STREAMING else "polling"
+_TOKEN_MAP_CONFIGURED = bool(settings.token_map())
+
 
 # =============================================================================
 # Global State
@@ -61,6 +84,8 @@ class AppState:
         self.betfair_client: Optional[BetfairClient] = None
         self.price_feed: Optional[AsyncBetfairPollFeed | AsyncBetfairStreamFeed] = None
         self.keep_alive_task: Optional[asyncio.Task] = None
+        self.snapshot_task: Optional[asyncio.Task] = None
+        self.owner_watch_task: Optional[asyncio.Task] = None
 
         # Polymarket components
         self.rfq_listener: Optional[
@@ -70,6 +95,8 @@ class AppState:
         # Common
         self.stop_event: Optional[asyncio.Event] = None
         self.started_at: Optional[datetime] = None
+        self.feed_owner_fd: Optional[int] = None
+        self.is_feed_owner: bool = True
 
 
 state = AppState()
@@ -102,15 +129,117 @@ async def betfair_keep_alive_loop(client: BetfairClient, stop_event: asyncio.Eve
     logger.info("Betfair keep-alive loop stopped")
 
 
+def _quotes_view(quotes: dict) -> dict:
+    """Body of /quotes for the listener's active quotes."""
+    return {
+        "active_quotes": len(quotes),
+        "quotes": {
+            qid: {
+                "request_id": q.request_id,
+                "token_id": q.token_id,
+                "price": q.price,
+                "side": q.side,
+                "size": q.size,
+                "status": q.status,
+                "created_at": q.created_at.isoformat() if q.created_at else None,
+            }
+            for qid, q in quotes.items()
+        },
+    }
+
+
+def _build_feed_snapshot() -> bytes:
+    """Serialize everything the read endpoints need from this process's feeds."""
+    feed = state.price_feed
+    return orjson.dumps(
+        {
+            "started_at": state.started_at,
+            "price_feed": feed is not None,
+            "prices": feed.get_all_snapshots() if feed else {},
+            "quotes": _quotes_view(state.rfq_listener.active_quotes) if state.rfq_listener else None,
+        },
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def _write_feed_snapshot(data: bytes) -> None:
+    """Replace FEED_SNAPSHOT_PATH atomically so readers never see a partial file."""
+    tmp_path = f"{FEED_SNAPSHOT_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, FEED_SNAPSHOT_PATH)
+
+
+async def feed_snapshot_loop(stop_event: asyncio.Event) -> None:
+    """Publish the feed snapshot for the other workers every FEED_SNAPSHOT_INTERVAL (owner only)."""
+    logger.info("Publishing feed snapshot to %s every %.2fs", FEED_SNAPSHOT_PATH, FEED_SNAPSHOT_INTERVAL)
+
+    while not stop_event.is_set():
+        try:
+            _write_feed_snapshot(_build_feed_snapshot())
+        except Exception:
+            logger.exception("Error publishing feed snapshot")
+
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=FEED_SNAPSHOT_INTERVAL)
+            break
+        except asyncio.TimeoutError:
+            pass
+
+    try:
+        os.unlink(FEED_SNAPSHOT_PATH)
+    except FileNotFoundError:
+        pass
+
+
+# (inode, mtime_ns) of the snapshot file last parsed, and its contents.
+_shared_snapshot_cache: dict = {"key": None, "value": None}
+
+
+def _shared_snapshot() -> Optional[dict]:
+    """The feed owner's latest snapshot, or None if it is missing or stale (non-owner workers)."""
+    try:
+        st = os.stat(FEED_SNAPSHOT_PATH)
+    except FileNotFoundError:
+        return None
+    if time.time() - st.st_mtime > FEED_SNAPSHOT_MAX_AGE:
+        return None
+    key = (st.st_ino, st.st_mtime_ns)
+    if _shared_snapshot_cache["key"] != key:
+        with open(FEED_SNAPSHOT_PATH, "rb") as f:
+            value = orjson.loads(f.read())
+        _shared_snapshot_cache.update(key=key, value=value)
+    return _shared_snapshot_cache["value"]
+
+
 # =============================================================================
 # Lifecycle
 # =============================================================================
 
-@asynccontextmanager
-async def lifespan(_app: FastAPI):
-    """Startup and shutdown lifecycle."""
-    logger.info("Starting totem-mm")
+def _claim_feed_owner() -> bool:
+    """Return True if this process should run the Betfair/Polymarket feeds.
+
+    Always True for a single worker. With several workers, the first process to take
+    an exclusive lock on FEED_OWNER_LOCK owns the feeds; the fd is kept open for the
+    process lifetime so the lock is released only when the owner exits.
+    """
+    if UVICORN_WORKERS <= 1:
+        return True
 
+    import fcntl
+
+    fd = os.open(FEED_OWNER_LOCK, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    state.feed_owner_fd = fd
+    return True
+
+
+async def start_feeds() -> None:
+    """Start the Betfair price feed, the Polymarket RFQ listener and (multi-worker) the snapshot publisher."""
     # ── Betfair Price Feed ──────────────────────────────────────────────
     if not BETFAIR_MARKET_IDS:
         logger.error("BETFAIR_MARKET_IDS not configured. Set it in .env (comma-separated market IDs)")
@@ -176,10 +305,10 @@ async def lifespan(_app: FastAPI):
             )
 
         # ── Polymarket RFQ System ─────────────────────────────────────
-        if settings.TOKEN_MAP:
+        if settings.token_map():
             polymarket_client = PolymarketClient()
             quote_engine = QuoteEngine(
-                token_map=settings.TOKEN_MAP,
+                token_map=settings.token_map(),
                 spread=settings.RFQ_CONFIG["SPREAD"],
                 max_quote_size_usdc=settings.RFQ_CONFIG["MAX_QUOTE_SIZE_USDC"],
                 max_exposure_usdc=settings.RFQ_CONFIG["MAX_EXPOSURE_USDC"],
@@ -237,11 +366,58 @@ async def lifespan(_app: FastAPI):
 
         state.started_at = datetime.now()
 
+    if UVICORN_WORKERS > 1:
+        if state.stop_event is None:
+            state.stop_event = asyncio.Event()
+        state.snapshot_task = asyncio.create_task(feed_snapshot_loop(state.stop_event))
+
+
+async def feed_owner_watch_loop() -> None:
+    """Non-owner workers: retry FEED_OWNER_LOCK and start the feeds once it is won.
+
+    The lock is released when the owning process exits (or is recycled by uvicorn), so
+    one of the remaining workers takes over within FEED_OWNER_RETRY_INTERVAL.
+    """
+    while not _claim_feed_owner():
+        await asyncio.sleep(FEED_OWNER_RETRY_INTERVAL)
+
+    logger.info("Took over feed ownership (pid=%d)", os.getpid())
+    try:
+        await start_feeds()
+    except Exception:
+        logger.exception("Error starting feeds after taking over ownership")
+    # Reads switch from the (now stale) shared snapshot to this process's feeds.
+    state.is_feed_owner = True
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Startup and shutdown lifecycle."""
+    logger.info("Starting totem-mm (pid=%d)", os.getpid())
+
+    if _claim_feed_owner():
+        await start_feeds()
+    else:
+        logger.info(
+            "Feeds owned by another worker — serving reads from %s (pid=%d)",
+            FEED_SNAPSHOT_PATH,
+            os.getpid(),
+        )
+        state.is_feed_owner = False
+        state.owner_watch_task = asyncio.create_task(feed_owner_watch_loop())
+
     yield
 
     # ── cleanup ────────────────────────────────────────────────────
     logger.info("Shutting down totem-mm")
 
+    if state.owner_watch_task:
+        state.owner_watch_task.cancel()
+        try:
+            await state.owner_watch_task
+        except asyncio.CancelledError:
+            pass
+
     if state.stop_event:
         state.stop_event.set()
 
@@ -258,6 +434,12 @@ async def lifespan(_app: FastAPI):
         except asyncio.TimeoutError:
             state.keep_alive_task.cancel()
 
+    if state.snapshot_task:
+        await state.snapshot_task
+
+    if state.feed_owner_fd is not None:
+        os.close(state.feed_owner_fd)
+
     logger.info("totem-mm stopped cleanly")
 
 
@@ -280,8 +462,13 @@ app = FastAPI(
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
+    if state.is_feed_owner:
+        feed_up = state.price_feed is not None
+    else:
+        snapshot = _shared_snapshot()
+        feed_up = bool(snapshot and snapshot["price_feed"])
     return {
-        "status": "healthy" if state.price_feed else "degraded",
+        "status": "healthy" if feed_up else "degraded",
         "timestamp": datetime.now().isoformat(),
     }
 
@@ -289,32 +476,44 @@ async def health_check():
 @app.get("/status")
 async def get_status():
     """Get current system status."""
-    uptime = None
-    if state.started_at:
-        uptime = (datetime.now() - state.started_at).total_seconds()
+    if state.is_feed_owner:
+        started_at = state.started_at
+        feed_up = state.price_feed is not None
+        rfq_enabled = state.rfq_listener is not None
+    else:
+        snapshot = _shared_snapshot() or {}
+        started_at = snapshot.get("started_at")
+        started_at = datetime.fromisoformat(started_at) if started_at else None
+        feed_up = bool(snapshot.get("price_feed"))
+        rfq_enabled = snapshot.get("quotes") is not None
 
-    betfair_mode = "streaming" if USE_BETFAIR_STREAMING else "polling"
-    polymarket_mode = "streaming" if USE_POLYMARKET_STREAMING else "polling"
+    uptime = None
+    if started_at:
+        uptime = (datetime.now() - started_at).total_seconds()
 
     return {
-        "status": "running" if state.price_feed else "stopped",
-        "started_at": state.started_at.isoformat() if state.started_at else None,
+        "status": "running" if feed_up else "stopped",
+        "started_at": started_at.isoformat() if started_at else None,
         "uptime_seconds": uptime,
         "betfair_market_ids": BETFAIR_MARKET_IDS,
-        "betfair_mode": betfair_mode,
-        "polymarket_mode": polymarket_mode,
-        "rfq_enabled": state.rfq_listener is not None,
-        "token_map_configured": bool(settings.TOKEN_MAP),
+        "betfair_mode": BETFAIR_MODE,
+        "polymarket_mode": POLYMARKET_MODE,
+        "rfq_enabled": rfq_enabled,
+        "token_map_configured": _TOKEN_MAP_CONFIGURED,
     }
 
 
 @app.get("/prices")
 async def get_prices(market_id: Optional[str] = None):
     """Get current Betfair prices."""
-    if not state.price_feed:
+    if not state.is_feed_owner:
+        snapshot = _shared_snapshot()
+        if not snapshot or not snapshot["price_feed"]:
+            raise HTTPException(status_code=503, detail="Price feed not running")
+        prices = snapshot["prices"].get(market_id, {}) if market_id else snapshot["prices"]
+    elif not state.price_feed:
         raise HTTPException(status_code=503, detail="Price feed not running")
-
-    if market_id:
+    elif market_id:
         prices = state.price_feed.get_snapshot(market_id)
     else:
         prices = state.price_feed.get_all_snapshots()
@@ -329,37 +528,24 @@ async def get_prices(market_id: Optional[str] = None):
 @app.get("/quotes")
 async def get_active_quotes():
     """Get active RFQ quotes."""
+    if not state.is_feed_owner:
+        snapshot = _shared_snapshot()
+        if not snapshot or snapshot["quotes"] is None:
+            raise HTTPException(status_code=404, detail="RFQ system not enabled")
+        return snapshot["quotes"]
+
     if not state.rfq_listener:
         raise HTTPException(status_code=404, detail="RFQ system not enabled")
 
-    quotes = state.rfq_listener.active_quotes
-    return {
-        "active_quotes": len(quotes),
-        "quotes": {
-            qid: {
-                "request_id": q.request_id,
-                "token_id": q.token_id,
-                "price": q.price,
-                "side": q.side,
-                "size": q.size,
-                "status": q.status,
-                "created_at": q.created_at.isoformat() if q.created_at else None,
-            }
-            for qid, q in quotes.items()
-        },
-    }
-
+    return _quotes_view(state.rfq_listener.active_quotes)
 
-@app.get("/config")
-async def get_config():
-    """Get current configuration."""
-    betfair_mode = "streaming" if USE_BETFAIR_STREAMING else "polling"
-    polymarket_mode = "streaming" if USE_POLYMARKET_STREAMING else "polling"
 
-    return {
+def _build_config_response() -> bytes:
+    """Serialize the /config body. Every field is fixed at import, so this runs once."""
+    return orjson.dumps({
         "betfair_market_ids": BETFAIR_MARKET_IDS,
-        "betfair_mode": betfair_mode,
-        "polymarket_mode": polymarket_mode,
+        "betfair_mode": BETFAIR_MODE,
+        "polymarket_mode": POLYMARKET_MODE,
         "keep_alive_interval": KEEP_ALIVE_INTERVAL,
         "rfq_config": {
             "poll_interval": settings.RFQ_CONFIG["POLL_INTERVAL"],
@@ -378,8 +564,17 @@ async def get_config():
             "dry_run": settings.RFQ_EXECUTION_CONFIG["DRY_RUN"],
             "approve_orders": settings.RFQ_EXECUTION_CONFIG["APPROVE_ORDERS"],
         },
-        "token_map_entries": len(settings.TOKEN_MAP),
-    }
+        "token_map_entries": len(settings.token_map()),
+    })
+
+
+_CONFIG_RESPONSE_BYTES = _build_config_response()
+
+
+@app.get("/config")
+async def get_config():
+    """Get current configuration."""
+    return Response(content=_CONFIG_RESPONSE_BYTES, media_type="application/json")
 
 
 # =============================================================================
@@ -389,6 +584,10 @@ async def get_config():
 #   python main.py
 # Or: python -m uvicorn main:app --host 0.0.0.0 --port 8000
 # Avoid using the bare "uvicorn" command if your PATH points at system Python.
+#
+# UVICORN_WORKERS=N runs N processes sharing the listening socket; see _claim_feed_owner
+# and feed_snapshot_loop.
+# uvicorn picks uvloop/httptools automatically when they are installed.
 
 if __name__ == "__main__":
     import uvicorn
@@ -396,4 +595,8 @@ if __name__ == "__main__":
     host = os.environ.get("HOST", "0.0.0.0")
     port = int(os.environ.get("PORT", "8000"))
 
-    uvicorn.run(app, host=host, port=port)
+    if UVICORN_WORKERS > 1:
+        # Multiple workers need an import string so each process can load the app.
+        uvicorn.run("main:app", host=host, port=port, workers=UVICORN_WORKERS)
+    else:
+        uvicorn.run(app, host=host, port=port)
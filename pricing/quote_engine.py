@@ -7,6 +7,7 @@ logger = logging.getLogger(__name__)
 
 # Polymarket conditional tokens and USDC on Polygon both use 6 decimal places.
 _TOKEN_DECIMALS = 6
+_TOKEN_SCALE = 10**_TOKEN_DECIMALS
 
 
 class QuoteEngineError(Exception):
@@ -38,6 +39,15 @@ class QuoteEngine:
     Only tokens present in the map will be quoted; everything else is skipped.
     """
 
+    __slots__ = (
+        "_token_map",
+        "_spread",
+        "_max_quote_size_usdc",
+        "_max_exposure_usdc",
+        "_open_exposure_usdc",
+        "_side_table",
+    )
+
     DEFAULT_SPREAD: float = 0.03
     DEFAULT_MAX_QUOTE_SIZE_USDC: float = 100.0
     DEFAULT_MAX_EXPOSURE_USDC: float = 1_000.0
@@ -65,6 +75,11 @@ class QuoteEngine:
             else self.DEFAULT_MAX_EXPOSURE_USDC
         )
         self._open_exposure_usdc: float = 0.0
+        # requester side → (our side, signed spread)
+        self._side_table: dict[str, tuple[str, float]] = {
+            "BUY": ("SELL", self._spread),
+            "SELL": ("BUY", -self._spread),
+        }
 
     # ── exposure tracking ─────────────────────────────────────────
 
@@ -92,12 +107,16 @@ class QuoteEngine:
         Returns ``None`` when the request cannot or should not be quoted
         (unknown token, stale Betfair data, no remaining capacity).
         """
+        token_map = self._token_map
+        max_exp = self._max_exposure_usdc
+        open_exp = self._open_exposure_usdc
+
         token_id = rfq_request.get("token")
         if not token_id:
             logger.debug("RFQ request missing 'token' field — skipping")
             return None
 
-        selection_id = self._token_map.get(token_id)
+        selection_id = token_map.get(token_id)
         if selection_id is None:
             logger.debug("No Betfair mapping for token %s — skipping", token_id)
             return None
@@ -107,8 +126,16 @@ class QuoteEngine:
             logger.warning("No Betfair odds for selection %s (token=%s)", selection_id, token_id)
             return None
 
-        mid = self._compute_mid(odds)
-        if mid is None:
+        # Implied mid-probability from Betfair back/lay.
+        back = odds.get("back")
+        lay = odds.get("lay")
+        if back and lay:
+            mid = (1.0 / back + 1.0 / lay) / 2.0
+        elif back:
+            mid = 1.0 / back
+        elif lay:
+            mid = 1.0 / lay
+        else:
             logger.warning("Could not compute mid-price for selection %s", selection_id)
             return None
 
@@ -124,13 +151,15 @@ class QuoteEngine:
             logger.debug("Request size is zero for token %s", token_id)
             return None
 
-        quote_size = self._cap_size(request_size_tokens, quote_price)
+        quote_size = self._cap_size(
+            request_size_tokens, quote_price, max(0.0, max_exp - open_exp)
+        )
         if quote_size <= 0:
             logger.info(
                 "No available capacity for token %s (exposure=%.2f / %.2f)",
                 token_id,
-                self._open_exposure_usdc,
-                self._max_exposure_usdc,
+                open_exp,
+                max_exp,
             )
             return None
 
@@ -142,11 +171,12 @@ class QuoteEngine:
             quote_price,
             quote_size,
             mid,
-            odds.get("back"),
-            odds.get("lay"),
+            back,
+            lay,
         )
 
-        return PriceQuote(
+        # Fields are already-validated locals; skip pydantic validation on the hot path.
+        return PriceQuote.model_construct(
             token_id=token_id,
             price=quote_price,
             side=our_side,
@@ -155,26 +185,19 @@ class QuoteEngine:
 
     # ── internal helpers ──────────────────────────────────────────
 
-    @staticmethod
-    def _compute_mid(odds: dict[str, Any]) -> float | None:
-        """Derive implied mid-probability from Betfair back/lay."""
-        back = odds.get("back")
-        lay = odds.get("lay")
-        if back and lay:
-            return (1.0 / back + 1.0 / lay) / 2.0
-        if back:
-            return 1.0 / back
-        if lay:
-            return 1.0 / lay
-        return None
-
     def _apply_spread(self, mid: float, requester_side: str) -> tuple[str, float]:
-        """Return *(our_side, quote_price)* with spread applied and price clamped to [0.01, 0.99]."""
-        if requester_side == "BUY":
-            our_side, raw = "SELL", mid + self._spread
-        else:
-            our_side, raw = "BUY", mid - self._spread
-        return our_side, max(0.01, min(0.99, round(raw, 6)))
+        """Return *(our_side, quote_price)* with spread applied and price clamped to [0.01, 0.99].
+
+        ``requester_side`` must already be validated as "BUY" or "SELL".
+        """
+        our_side, delta = self._side_table[requester_side]
+        raw = mid + delta
+        if raw < 0.01:
+            return our_side, 0.01
+        if raw > 0.99:
+            return our_side, 0.99
+        # Positive after the clamp, so int(x + 0.5) rounds half-up to 6 dp.
+        return our_side, int(raw * 1e6 + 0.5) / 1e6
 
     @staticmethod
     def _parse_request_size(rfq_request: dict[str, Any], requester_side: str) -> float:
@@ -197,21 +220,20 @@ class QuoteEngine:
 
         # Heuristic: values in base units are typically large integers (>= 1e6).
         # If the value looks like a small number, treat it as already being in tokens.
-        is_base_units = False
+        # A string with a decimal point is always human token units.
         if isinstance(raw, (int, float)):
-            is_base_units = value >= 10**_TOKEN_DECIMALS
-        elif isinstance(raw, str):
-            if "." in raw:
-                is_base_units = False
-            else:
-                is_base_units = value >= 10**_TOKEN_DECIMALS
+            is_base_units = value >= _TOKEN_SCALE
+        else:
+            is_base_units = isinstance(raw, str) and "." not in raw and value >= _TOKEN_SCALE
 
-        return value / (10**_TOKEN_DECIMALS) if is_base_units else value
+        return value / _TOKEN_SCALE if is_base_units else value
 
-    def _cap_size(self, request_tokens: float, price: float) -> float:
+    def _cap_size(
+        self, request_tokens: float, price: float, available_exposure_usdc: float
+    ) -> float:
         """Return the largest quote size (in tokens) that fits within per-quote and portfolio limits."""
         if price <= 0:
             return 0.0
         max_by_quote = self._max_quote_size_usdc / price
-        max_by_exposure = self.available_exposure_usdc / price
+        max_by_exposure = available_exposure_usdc / price
         return round(min(request_tokens, max_by_quote, max_by_exposure), 6)
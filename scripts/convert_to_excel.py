@@ -24,9 +24,9 @@ from pathlib import Path
 from typing import Optional, Tuple
 
 try:
-    import pandas as pd
+    from openpyxl import Workbook
 except ImportError:
-    print("ERROR: pandas not installed. Install with: pip install pandas openpyxl")
+    print("ERROR: openpyxl not installed. Install with: pip install openpyxl")
     sys.exit(1)
 
 # Setup logging
@@ -47,32 +47,26 @@ def parse_betfair_odds(odds_str: str) -> Optional[float]:
     if not odds_str or odds_str == "N/A":
         return None
     
+    # partition + direct arithmetic: no parts list or probs list per call.
+    back_str, sep, lay_str = odds_str.partition("/")
+    if not sep or "/" in lay_str:
+        return None
+    back_str = back_str.strip()
+    lay_str = lay_str.strip()
+    
     try:
-        # Split back/lay odds
-        parts = odds_str.split("/")
-        if len(parts) != 2:
-            return None
-        
-        back_str = parts[0].strip()
-        lay_str = parts[1].strip()
-        
         # Handle cases like "1.01/-" or "-/1.02"
         back = float(back_str) if back_str != "-" else None
         lay = float(lay_str) if lay_str != "-" else None
         
-        # Convert odds to probabilities
-        probs = []
+        # Convert odds to probabilities and return the average as a percentage
+        if back is not None and lay is not None:
+            return (1.0 / back + 1.0 / lay) / 2 * 100.0
         if back is not None:
-            probs.append(1.0 / back)
+            return 1.0 / back * 100.0
         if lay is not None:
-            probs.append(1.0 / lay)
-        
-        if not probs:
-            return None
-        
-        # Return average probability as percentage
-        avg_prob = sum(probs) / len(probs)
-        return avg_prob * 100.0
+            return 1.0 / lay * 100.0
+        return None
         
     except (ValueError, ZeroDivisionError):
         return None
@@ -92,15 +86,13 @@ def parse_polymarket_odds(odds_str: str) -> Optional[float]:
     if not odds_str or odds_str == "N/A":
         return None
     
+    bid_str, sep, ask_str = odds_str.partition("/")
+    if not sep or "/" in ask_str:
+        return None
+    bid_str = bid_str.strip()
+    ask_str = ask_str.strip()
+    
     try:
-        # Split bid/ask
-        parts = odds_str.split("/")
-        if len(parts) != 2:
-            return None
-        
-        bid_str = parts[0].strip()
-        ask_str = parts[1].strip()
-        
         # Handle cases like "0.001000/-"
         bid = float(bid_str) if bid_str != "-" else None
         ask = float(ask_str) if ask_str != "-" else None
@@ -119,6 +111,15 @@ def parse_polymarket_odds(odds_str: str) -> Optional[float]:
         return None
 
 
+# One pass over the fixed live_odds.txt layout instead of split + per-part label scans.
+_LINE_RE = re.compile(
+    r"^(?P<t>[^|]+?)\s*\|\s*Betfair Aus:\s*(?P<ba>\S+)"
+    r"\s*\|\s*Betfair Oman:\s*(?P<bo>\S+)"
+    r"\s*\|\s*Poly Aus:\s*(?P<pa>\S+)"
+    r"\s*\|\s*Poly Oman:\s*(?P<po>\S+)"
+)
+
+
 def parse_line(line: str) -> Optional[dict]:
     """Parse a line from live_odds.txt and extract data.
     
@@ -128,78 +129,80 @@ def parse_line(line: str) -> Optional[dict]:
     if not line or line.startswith("IST Time") or line.startswith("-"):
         return None
     
-    try:
-        # Split by pipe separator
-        parts = [p.strip() for p in line.split("|")]
-        if len(parts) < 5:
-            return None
-        
-        # Extract time (first part)
-        time_str = parts[0].strip()
-        
-        # Extract odds from each part
-        betfair_aus_str = None
-        betfair_oman_str = None
-        poly_aus_str = None
-        poly_oman_str = None
-        
-        for part in parts[1:]:
-            if "Betfair Aus:" in part:
-                betfair_aus_str = part.replace("Betfair Aus:", "").strip()
-            elif "Betfair Oman:" in part:
-                betfair_oman_str = part.replace("Betfair Oman:", "").strip()
-            elif "Poly Aus:" in part:
-                poly_aus_str = part.replace("Poly Aus:", "").strip()
-            elif "Poly Oman:" in part:
-                poly_oman_str = part.replace("Poly Oman:", "").strip()
-        
-        # Convert to probabilities (keep them separate for comparison)
-        betfair_aus_pct = parse_betfair_odds(betfair_aus_str)
-        betfair_oman_pct = parse_betfair_odds(betfair_oman_str)
-        poly_aus_pct = parse_polymarket_odds(poly_aus_str)
-        poly_oman_pct = parse_polymarket_odds(poly_oman_str)
-        
-        return {
-            "Time": time_str,
-            "Betfair Australia %": betfair_aus_pct,
-            "Betfair Oman %": betfair_oman_pct,
-            "Polymarket Australia %": poly_aus_pct,
-            "Polymarket Oman %": poly_oman_pct,
-        }
-        
-    except Exception as e:
-        logger.debug(f"Error parsing line: {e}")
+    m = _LINE_RE.match(line)
+    if m is None:
         return None
+    
+    # Convert to probabilities (keep them separate for comparison)
+    return {
+        "Time": m.group("t"),
+        "Betfair Australia %": parse_betfair_odds(m.group("ba")),
+        "Betfair Oman %": parse_betfair_odds(m.group("bo")),
+        "Polymarket Australia %": parse_polymarket_odds(m.group("pa")),
+        "Polymarket Oman %": parse_polymarket_odds(m.group("po")),
+    }
+
+
+def read_and_convert(
+    input_file: Path,
+    output_file: Path,
+    rows: Optional[list] = None,
+    offset: int = 0,
+) -> Tuple[int, int]:
+    """Parse lines appended to live_odds.txt since *offset* and rewrite the Excel file.
 
+    Parsed rows accumulate in *rows* across calls, so each call only reads the new
+    tail of the file; the Excel file is rewritten only when new rows arrived. A
+    trailing partial line is left for the next call. If the input shrank (truncated
+    or replaced), parsing restarts from the beginning.
 
-def read_and_convert(input_file: Path, output_file: Path) -> int:
-    """Read live_odds.txt and convert to Excel. Returns number of rows processed."""
+    Returns (number of new rows, offset to pass to the next call).
+    """
+    if rows is None:
+        rows = []
     if not input_file.exists():
         logger.warning(f"Input file not found: {input_file}")
-        return 0
+        return 0, offset
+    
+    if input_file.stat().st_size < offset:
+        logger.info(f"{input_file} shrank; re-reading from the start")
+        rows.clear()
+        offset = 0
     
-    logger.info(f"Reading {input_file}...")
+    with open(input_file, 'rb') as f:
+        f.seek(offset)
+        chunk = f.read()
     
-    rows = []
-    with open(input_file, 'r') as f:
-        for line in f:
-            data = parse_line(line)
-            if data:
-                rows.append(data)
+    # Only consume complete lines; the writer may be mid-line.
+    end = chunk.rfind(b"\n") + 1
+    offset += end
+    
+    n_before = len(rows)
+    for line in chunk[:end].decode("utf-8", errors="replace").splitlines():
+        data = parse_line(line)
+        if data:
+            rows.append(data)
+    new_rows = len(rows) - n_before
     
     if not rows:
         logger.warning("No valid data found in input file")
-        return 0
-    
-    # Create DataFrame
-    df = pd.DataFrame(rows)
+        return 0, offset
+    if new_rows == 0:
+        logger.debug("No new rows since last update")
+        return 0, offset
     
-    # Write to Excel
-    logger.info(f"Writing {len(rows)} rows to {output_file}...")
-    df.to_excel(output_file, index=False, sheet_name='Live Odds')
+    # Write to Excel. A write-only workbook streams rows straight to the file, but it
+    # can only be saved once, so a fresh one is built for each update.
+    logger.info(f"Writing {len(rows)} rows to {output_file} ({new_rows} new)...")
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Live Odds')
+    ws.append(list(rows[0].keys()))
+    for row in rows:
+        ws.append(list(row.values()))
+    wb.save(output_file)
     
     logger.info(f"✓ Excel file updated: {output_file} ({len(rows)} rows)")
-    return len(rows)
+    return new_rows, offset
 
 
 def main():
@@ -248,12 +251,14 @@ def main():
         read_and_convert(input_file, output_file)
         return
     
-    # Continuous loop
+    # Continuous loop: rows and the file offset persist so each pass only parses new lines
     logger.info("Starting continuous conversion (press Ctrl+C to stop)...")
+    rows: list = []
+    offset = 0
     try:
         while True:
-            rows = read_and_convert(input_file, output_file)
-            if rows > 0:
+            new_rows, offset = read_and_convert(input_file, output_file, rows, offset)
+            if new_rows > 0:
                 logger.info(f"Next update in {args.interval}s...")
             time.sleep(args.interval)
     except KeyboardInterrupt:
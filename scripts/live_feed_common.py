@@ -3,15 +3,19 @@ Shared helpers for live_feed_polling and live_feed_streaming.
 IST time, Betfair/Poly prob extraction, Poly HTTP.
 """
 
-import json
+import asyncio
+import functools
 import os
-import urllib.request
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
-import pytz
+import httpx
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
 
-IST = pytz.timezone("Asia/Kolkata")
+# India has no DST, so a fixed +05:30 offset is exact and avoids pytz's Python-level fromutc.
+IST = timezone(timedelta(hours=5, minutes=30), "IST")
 
 
 def ist_now() -> str:
@@ -19,6 +23,9 @@ def ist_now() -> str:
     return datetime.now(IST).strftime("%H:%M:%S")
 
 
+_NO_EX: dict = {}
+
+
 def betfair_odds_to_probs(odds: dict[int, dict]) -> dict[int, dict[str, float | None]]:
     """Convert feed snapshot (selection_id -> {back, lay, last_traded}) to back_pct, lay_pct, last_pct."""
     out: dict[int, dict[str, float | None]] = {}
@@ -27,9 +34,9 @@ def betfair_odds_to_probs(odds: dict[int, dict]) -> dict[int, dict[str, float |
         lay = o.get("lay")
         last = o.get("last_traded")
         out[sid] = {
-            "back_pct": (100.0 / back) if back else None,
-            "lay_pct": (100.0 / lay) if lay else None,
-            "last_pct": (100.0 / last) if last else None,
+            "back_pct": 100.0 / back if back else None,
+            "lay_pct": 100.0 / lay if lay else None,
+            "last_pct": 100.0 / last if last else None,
         }
     return out
 
@@ -40,33 +47,74 @@ def betfair_book_to_probs(market_book: dict) -> dict[int, dict[str, float | None
     selection_id -> { "back_pct", "lay_pct", "last_pct" } (percent 0-100 or None).
     """
     out: dict[int, dict[str, float | None]] = {}
-    for r in market_book.get("runners") or []:
+    for r in market_book.get("runners") or ():
         sid = r.get("selectionId")
         if sid is None:
             continue
-        ex = r.get("ex") or {}
-        atb = ex.get("availableToBack") or []
-        atl = ex.get("availableToLay") or []
+        # Missing "ex" / ladders are common on suspended runners; avoid building
+        # throwaway {} / [] for them.
+        ex = r.get("ex") or _NO_EX
+        atb = ex.get("availableToBack")
+        atl = ex.get("availableToLay")
         back = atb[0]["price"] if atb else None
         lay = atl[0]["price"] if atl else None
         last = r.get("lastPriceTraded")
         out[sid] = {
-            "back_pct": (100.0 / back) if back else None,
-            "lay_pct": (100.0 / lay) if lay else None,
-            "last_pct": (100.0 / last) if last else None,
+            "back_pct": 100.0 / back if back else None,
+            "lay_pct": 100.0 / lay if lay else None,
+            "last_pct": 100.0 / last if last else None,
         }
     return out
 
 
+_NO_PROBS: tuple[None, None, None] = (None, None, None)
+
+
+def betfair_book_to_probs_ordered(
+    market_book: dict, ordered_sids: list[int]
+) -> list[tuple[float | None, float | None, float | None]]:
+    """
+    Like betfair_book_to_probs, but returns (back_pct, lay_pct, last_pct) tuples aligned
+    to ordered_sids, so per-tick callers index by position instead of looking up by sid.
+    Runners missing from the book yield (None, None, None).
+    """
+    out: list[tuple[float | None, float | None, float | None]] = [_NO_PROBS] * len(ordered_sids)
+    for r in market_book.get("runners") or ():
+        try:
+            i = ordered_sids.index(r.get("selectionId"))
+        except ValueError:
+            continue
+        ex = r.get("ex") or _NO_EX
+        atb = ex.get("availableToBack")
+        atl = ex.get("availableToLay")
+        back = atb[0]["price"] if atb else None
+        lay = atl[0]["price"] if atl else None
+        last = r.get("lastPriceTraded")
+        out[i] = (
+            100.0 / back if back else None,
+            100.0 / lay if lay else None,
+            100.0 / last if last else None,
+        )
+    return out
+
+
 def poly_book_to_probs(book: dict) -> tuple[float | None, float | None, float | None]:
     """
     From CLOB /book response: (best_bid, best_ask, last_trade_price) as 0-1 price.
     best_bid = max of bids price, best_ask = min of asks price.
     """
-    bids = book.get("bids") or []
-    asks = book.get("asks") or []
-    best_bid = max((float(b["price"]) for b in bids), default=None) if bids else None
-    best_ask = min((float(a["price"]) for a in asks), default=None) if asks else None
+    # CLOB /book level order is not a documented contract, so scan once rather than
+    # trusting bids[0] / asks[0]; converts and compares in the same pass.
+    best_bid = None
+    for b in book.get("bids") or ():
+        p = float(b["price"])
+        if best_bid is None or p > best_bid:
+            best_bid = p
+    best_ask = None
+    for a in book.get("asks") or ():
+        p = float(a["price"])
+        if best_ask is None or p < best_ask:
+            best_ask = p
     ltp = book.get("last_trade_price")
     last = float(ltp) if ltp is not None else None
     return best_bid, best_ask, last
@@ -87,20 +135,107 @@ def poly_headers() -> dict[str, str]:
     }
 
 
-def fetch_poly_book(token_id: str) -> dict:
+def make_poly_session() -> requests.Session:
+    """
+    Keep-alive session for Polymarket calls: reuses the TLS connection instead of
+    handshaking per request. The pool is sized for the concurrent per-token fetches
+    issued from the polling thread pools; proxy lookup from the environment is skipped.
+    """
+    session = requests.Session()
+    session.headers.update(poly_headers())
+    session.headers["Connection"] = "keep-alive"
+    session.trust_env = False
+    session.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+    return session
+
+
+# Default for callers that do not pass their own session.
+_POLY_SESSION = make_poly_session()
+
+
+def fetch_poly_book(token_id: str, session: requests.Session | None = None) -> dict:
     url = f"https://clob.polymarket.com/book?token_id={token_id}"
-    req = urllib.request.Request(url, headers=poly_headers())
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read().decode())
+    resp = (session or _POLY_SESSION).get(url, timeout=10)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
 
 
-def fetch_poly_prices(token_id: str) -> dict:
+def fetch_poly_books(token_ids: list[str], session: requests.Session | None = None) -> dict[str, dict]:
+    """
+    Order books for several tokens in one request (CLOB POST /books), keyed by token_id.
+    Falls back to one /book request per token if the bulk endpoint rejects the call (4xx).
+    """
+    url = "https://clob.polymarket.com/books"
+    body = orjson.dumps([{"token_id": tid} for tid in token_ids])
+    resp = (session or _POLY_SESSION).post(
+        url, data=body, headers={"Content-Type": "application/json"}, timeout=10
+    )
+    if 400 <= resp.status_code < 500:
+        return {tid: fetch_poly_book(tid, session) for tid in token_ids}
+    resp.raise_for_status()
+    books = orjson.loads(resp.content)
+    return {b.get("asset_id"): b for b in books}
+
+
+def fetch_poly_prices(token_id: str, session: requests.Session | None = None) -> dict:
     url = f"https://clob.polymarket.com/prices-history?market={token_id}&interval=1h&fidelity=1"
-    req = urllib.request.Request(url, headers=poly_headers())
-    with urllib.request.urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read().decode())
+    resp = (session or _POLY_SESSION).get(url, timeout=10)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+POLY_CLOB_URL = "https://clob.polymarket.com"
+
+
+def make_poly_async_client() -> httpx.AsyncClient:
+    """
+    Async counterpart of make_poly_session for asyncio writers: one keep-alive client
+    shared by all concurrent fetches, rooted at POLY_CLOB_URL. Every request is
+    multiplexed over a single HTTP/2 connection (one TLS handshake, compressed headers);
+    h2 comes with the httpx[http2] dependency, and httpx raises ImportError here if it
+    is missing rather than quietly falling back to HTTP/1.1.
+    """
+    return httpx.AsyncClient(
+        base_url=POLY_CLOB_URL,
+        headers=poly_headers(),
+        http2=True,
+        limits=httpx.Limits(max_connections=1),
+        timeout=10,
+        trust_env=False,
+    )
+
+
+async def afetch_poly_book(client: httpx.AsyncClient, token_id: str) -> dict:
+    resp = await client.get("/book", params={"token_id": token_id})
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+async def afetch_poly_books(client: httpx.AsyncClient, token_ids: list[str]) -> dict[str, dict]:
+    """Async fetch_poly_books: one POST /books, falling back to concurrent /book calls on 4xx."""
+    resp = await client.post(
+        "/books",
+        content=orjson.dumps([{"token_id": tid} for tid in token_ids]),
+        headers={"Content-Type": "application/json"},
+    )
+    if 400 <= resp.status_code < 500:
+        books = await asyncio.gather(*(afetch_poly_book(client, tid) for tid in token_ids))
+        return dict(zip(token_ids, books))
+    resp.raise_for_status()
+    return {b.get("asset_id"): b for b in orjson.loads(resp.content)}
+
+
+async def afetch_poly_prices(client: httpx.AsyncClient, token_id: str) -> dict:
+    resp = await client.get("/prices-history", params={"market": token_id, "interval": "1h", "fidelity": 1})
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+# The env getters below are cached: .env is loaded once at script start-up, so the
+# values cannot change afterwards. Callers must treat the returned dict/list as read-only.
 
 
+@functools.lru_cache(maxsize=1)
 def get_team_labels() -> tuple[str, str]:
     """Labels for the two runners (first, second by selection_id). Defaults: AUS, IND."""
     a = (os.environ.get("TEAM_A") or "").strip() or "AUS"
@@ -108,11 +243,13 @@ def get_team_labels() -> tuple[str, str]:
     return a, b
 
 
+@functools.lru_cache(maxsize=1)
 def get_token_map() -> dict[str, int]:
     raw = os.environ.get("TOKEN_MAP", "{}")
-    return json.loads(raw) if raw else {}
+    return orjson.loads(raw) if raw else {}
 
 
+@functools.lru_cache(maxsize=1)
 def get_market_ids() -> list[str]:
     raw = os.environ.get("BETFAIR_MARKET_IDS", "")
     return [m.strip() for m in raw.split(",") if m.strip()]
@@ -0,0 +1,19 @@
+"""
+Row schema of the live-feed text files (live_odds_polling.txt / live_odds_streaming.txt),
+shared by the readers (prometheus_exporter, live_feed_polling_with_plots). Stdlib only:
+the exporter container installs nothing but python-dotenv.
+
+    IST | A BF: back/lay/last | B BF: back/lay/last | A Poly: bid/ask/lt/price | B Poly: bid/ask/lt/price
+
+Column offsets depend on the team labels, so rows are split on "|" and "/" rather than sliced.
+"""
+
+# Value columns in row order (probabilities in % 0-100; "-" when missing).
+ROW_COLUMNS = (
+    "bf_back_a", "bf_lay_a", "bf_last_a",
+    "bf_back_b", "bf_lay_b", "bf_last_b",
+    "poly_bid_a", "poly_ask_a", "poly_lt_a", "poly_price_a",
+    "poly_bid_b", "poly_ask_b", "poly_lt_b", "poly_price_b",
+)
+# Cells per "|"-separated group after the time: BF back/lay/last ×2, Poly bid/ask/lt/price ×2.
+ROW_GROUP_WIDTHS = (3, 3, 4, 4)
@@ -6,21 +6,22 @@ Columns: IST, Betfair probs (back, lay, last) per runner, Polymarket (bid, ask,
 Uses .env: BETFAIR_MARKET_IDS, TOKEN_MAP, TEAM_A, TEAM_B (display labels), plus Betfair credentials.
 """
 
+import atexit
 import os
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, SCRIPT_DIR)
 
-import dotenv
-dotenv.load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+import settings  # noqa: F401  (loads .env)
 
 from live_feed_common import (
-    betfair_book_to_probs,
-    fetch_poly_book,
+    betfair_book_to_probs_ordered,
+    fetch_poly_books,
     fetch_poly_prices,
     get_market_ids,
     get_team_labels,
@@ -38,7 +39,7 @@ POLL_INTERVAL = 1.0
 def _fmt(x: float | None) -> str:
     if x is None:
         return ""
-    return f"{x:.4f}"
+    return "%.4f" % x
 
 
 def fetch_betfair_book():
@@ -66,68 +67,93 @@ def main():
     # Order: by selection_id (first = team_a, second = team_b)
     team_a, team_b = get_team_labels()
     sel_to_token = {sel_id: tid for tid, sel_id in token_map.items()}
-    selection_ids_ordered = sorted(sel_to_token.keys())
+    # Rows (like the header, the exporter and the plots) cover the two teams only: any
+    # further runner (e.g. the draw) is neither fetched nor written.
+    selection_ids_ordered = sorted(sel_to_token.keys())[:2]
+    token_ids_ordered = [sel_to_token[sid] for sid in selection_ids_ordered]
+    labels = [lbl.replace("%", "%%") for lbl in (team_a, team_b)[: len(selection_ids_ordered)]]
+    # Row layout is fixed for the run; only the per-runner cell groups change per tick.
+    poly_fields = [f"{lbl} Poly: %-32s" for lbl in labels]
+    poly_fields[-1] = f"{labels[-1]} Poly: %s"
+    visual_template = " | ".join(["%s", *(f"{lbl} BF: %-28s" for lbl in labels), *poly_fields])
+    no_bf_cells = [("", "", "")] * len(selection_ids_ordered)
+
+    # All fetches are network-bound: one Betfair book, one bulk Polymarket /books call
+    # and prices-history per token, issued together so a tick costs ~1 RTT.
+    pool = ThreadPoolExecutor(max_workers=2 + len(token_ids_ordered))
 
     os.makedirs(DATA_DIR, exist_ok=True)
     header_line = f"IST     | {team_a} Betfair (back/lay/last)       | {team_b} Betfair (back/lay/last)      | {team_a} Poly (bid/ask/lt/price)           | {team_b} Poly (bid/ask/lt/price)"
     sep_line = "-" * 130
-    with open(POLLING_FILE, "a") as f:
-        if os.path.getsize(POLLING_FILE) == 0:
-            f.write(header_line + "\n")
-            f.write(sep_line + "\n")
-            f.flush()
+    need_header = not os.path.exists(POLLING_FILE) or os.path.getsize(POLLING_FILE) == 0
+
+    # Kept open for the whole run; line buffering flushes each row as it is written.
+    log_fp = open(POLLING_FILE, "a", buffering=1)
+    atexit.register(log_fp.close)
+    if need_header:
+        log_fp.write(header_line + "\n")
+        log_fp.write(sep_line + "\n")
 
     print("Polling every", POLL_INTERVAL, "s →", POLLING_FILE)
     print(header_line)
     print(sep_line)
+    # Fixed-rate schedule on the monotonic clock: each tick targets the previous
+    # deadline + POLL_INTERVAL, so samples stay phase-locked instead of drifting by
+    # the work time. If a tick overruns, missed deadlines are dropped (not bursted).
+    next_deadline = time.perf_counter()
     while True:
-        t0 = time.perf_counter()
-        row_parts = [ist_now()]
+        ist = ist_now()
+
+        bf_future = pool.submit(fetch_betfair_book)
+        books_future = pool.submit(fetch_poly_books, token_ids_ordered)
+        prices_futures = {tid: pool.submit(fetch_poly_prices, tid) for tid in token_ids_ordered}
 
-        bf = fetch_betfair_book()
+        # One (back, lay, last) cell group per runner, aligned to selection_ids_ordered.
+        bf = bf_future.result()
         if bf:
-            probs = betfair_book_to_probs(bf)
-            for sid in selection_ids_ordered:
-                p = probs.get(sid) or {}
-                row_parts.append(_fmt(p.get("back_pct")))
-                row_parts.append(_fmt(p.get("lay_pct")))
-                row_parts.append(_fmt(p.get("last_pct")))
+            bf_cells = [
+                (_fmt(back_pct), _fmt(lay_pct), _fmt(last_pct))
+                for back_pct, lay_pct, last_pct in betfair_book_to_probs_ordered(bf, selection_ids_ordered)
+            ]
         else:
-            for _ in selection_ids_ordered:
-                row_parts.extend(["", "", ""])
-
-        for tid in [sel_to_token[sid] for sid in selection_ids_ordered]:
+            bf_cells = no_bf_cells
+
+        # One (bid, ask, last_trade, price) cell group per token, stored as % 0-100.
+        try:
+            books = books_future.result()
+        except Exception:
+            books = {}
+        poly_cells = []
+        for tid in token_ids_ordered:
             try:
-                book = fetch_poly_book(tid)
-                bid, ask, lt = poly_book_to_probs(book)
-                # store as % 0-100
-                row_parts.append(_fmt(bid * 100.0) if bid is not None else "")
-                row_parts.append(_fmt(ask * 100.0) if ask is not None else "")
-                row_parts.append(_fmt(lt * 100.0) if lt is not None else "")
-                pr = poly_prices_last(fetch_poly_prices(tid))
-                row_parts.append(_fmt(pr * 100.0) if pr is not None else "")
+                bid, ask, lt = poly_book_to_probs(books[tid])
+                pr = poly_prices_last(prices_futures[tid].result())
+                poly_cells.append((
+                    _fmt(bid * 100.0) if bid is not None else "",
+                    _fmt(ask * 100.0) if ask is not None else "",
+                    _fmt(lt * 100.0) if lt is not None else "",
+                    _fmt(pr * 100.0) if pr is not None else "",
+                ))
             except Exception:
-                row_parts.extend(["", "", "", ""])
+                poly_cells.append(("", "", "", ""))
 
         # Build visual line (same as terminal) and write to file + print
-        if len(row_parts) >= 15:
-            ist, ab, al, alt, bb, bl, blt, a_pb, a_pa, a_plt, a_pr, b_pb, b_pa, b_plt, b_pr = row_parts[:15]
-            a_bf = f"{ab or '-'}/{al or '-'}/{alt or '-'}"
-            b_bf = f"{bb or '-'}/{bl or '-'}/{blt or '-'}"
-            a_poly = f"{a_pb or '-'}/{a_pa or '-'}/{a_plt or '-'}/{a_pr or '-'}"
-            b_poly = f"{b_pb or '-'}/{b_pa or '-'}/{b_plt or '-'}/{b_pr or '-'}"
-            visual = f"{ist} | {team_a} BF: {a_bf:28} | {team_b} BF: {b_bf:28} | {team_a} Poly: {a_poly:32} | {team_b} Poly: {b_poly}"
-        else:
-            visual = "\t".join(row_parts)
-        with open(POLLING_FILE, "a") as f:
-            f.write(visual + "\n")
-            f.flush()
+        visual = visual_template % (
+            ist,
+            *("/".join(c or "-" for c in cells) for cells in bf_cells),
+            *("/".join(c or "-" for c in cells) for cells in poly_cells),
+        )
+        log_fp.write(visual + "\n")
         print(visual)
 
-        elapsed = time.perf_counter() - t0
-        sleep = max(0.0, POLL_INTERVAL - elapsed)
-        if sleep > 0:
-            time.sleep(sleep)
+        next_deadline += POLL_INTERVAL
+        now = time.perf_counter()
+        if now > next_deadline:
+            skipped = int((now - next_deadline) // POLL_INTERVAL) + 1
+            print(f"WARN: tick overran by {now - next_deadline:.3f}s, skipping {skipped} tick(s)", file=sys.stderr)
+            next_deadline = now
+        else:
+            time.sleep(next_deadline - now)
 
 
 if __name__ == "__main__":
@@ -5,7 +5,12 @@ thread; main thread runs a matplotlib window and redraws from the file every 1s.
 Run: python scripts/live_feed_polling_with_plots.py
 """
 
+import argparse
+import asyncio
+import mmap
 import os
+import re
+import struct
 import sys
 import threading
 import time
@@ -15,25 +20,31 @@ PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, SCRIPT_DIR)
 
-import dotenv
-dotenv.load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+import settings  # noqa: F401  (loads .env)
 
 from live_feed_common import (
-    betfair_book_to_probs,
-    fetch_poly_book,
-    fetch_poly_prices,
+    afetch_poly_books,
+    afetch_poly_prices,
+    betfair_book_to_probs_ordered,
     get_market_ids,
     get_team_labels,
     get_token_map,
     ist_now,
+    make_poly_async_client,
     poly_book_to_probs,
     poly_prices_last,
 )
+from live_feed_format import ROW_COLUMNS, ROW_GROUP_WIDTHS
 
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 POLLING_FILE = os.path.join(DATA_DIR, "live_odds_polling.txt")
+# Numeric sidecar of POLLING_FILE for the plots: one fixed-width record per row.
+POLLING_BIN_FILE = os.path.join(DATA_DIR, "live_odds_polling.bin")
 POLL_INTERVAL = 1.0
 PLOT_REFRESH_INTERVAL = 1.0
+PLOT_IDLE_INTERVAL = 0.05
+FSYNC_INTERVAL = 5.0
+SEP_LINE = "-" * 130
 
 # Optional: matplotlib may not be installed. Prefer backends that don't need tkinter (MacOSX on Mac).
 try:
@@ -57,12 +68,14 @@ try:
                 matplotlib.use("Agg")
                 _backend = "Agg"
     import matplotlib.pyplot as plt
+    import numpy as np
     from matplotlib.gridspec import GridSpec
     from matplotlib.ticker import MultipleLocator, MaxNLocator
     from matplotlib.patches import Rectangle
     HAS_MATPLOTLIB = True
 except ImportError:
     HAS_MATPLOTLIB = False
+    np = None
     GridSpec = None
     MultipleLocator = None
     MaxNLocator = None
@@ -70,59 +83,173 @@ except ImportError:
 
 
 def _fmt(x: float | None) -> str:
+    """One visual-line cell: 4 dp, or "-" when missing."""
     if x is None:
-        return ""
-    return f"{x:.4f}"
+        return "-"
+    return "%.4f" % x
 
 
-def _parse_float(s: str) -> float | None:
-    if not s or (s := s.strip()) == "-":
-        return None
+SERIES_KEYS = ROW_COLUMNS
+
+# "14:23:59 | AUS BF: 62.1/61.7/61.7 | IND BF: 38.4/37.8/38.4 | AUS Poly: 59/60/41/62.5 | IND Poly: 40/41/41/37.5"
+# → time plus the four slash-separated cell groups. Header and separator lines do not match.
+# Bytes pattern, matched in place against the mmapped file (match() anchors at pos).
+_LINE_RE = re.compile(
+    rb"\s*([^|]*?)\s*\|"
+    rb"[^|:]*:([^|]*)\|"
+    rb"[^|:]*:([^|]*)\|"
+    rb"[^|:]*:([^|]*)\|"
+    rb"[^|:]*:([^|]*)"
+)
+_GROUP_WIDTHS = ROW_GROUP_WIDTHS
+_INITIAL_CAPACITY = 1024
+
+# Incremental parse state: byte offset of the first line not yet consumed, and the
+# series accumulated so far as one (len(SERIES_KEYS), capacity) float array (one row
+# per series, NaN for missing cells) grown by doubling. Each refresh only maps what
+# the writer appended. Initialised on first parse (numpy is optional).
+_parse_state: dict = {"path": None, "offset": 0}
+
+
+# Binary row: unix time (u32) + the 14 series (f32, NaN when missing), little-endian.
+_BIN_RECORD = struct.Struct("<I14f")
+_IST_OFFSET_S = 5 * 3600 + 30 * 60
+
+
+def _bin_dtype():
+    return np.dtype([("ts", "<u4"), *((k, "<f4") for k in SERIES_KEYS)])
+
+
+def _ist_label(ts: int) -> str:
+    """HH:MM:SS in IST for a unix timestamp (same format as ist_now)."""
+    s = (ts + _IST_OFFSET_S) % 86400
+    return "%02d:%02d:%02d" % (s // 3600, s // 60 % 60, s % 60)
+
+
+def _reset_parse_state(filepath: str | None = None) -> None:
+    _parse_state.clear()
+    _parse_state.update({
+        "path": filepath,
+        "offset": 0,
+        "times": [],
+        "values": np.full((len(SERIES_KEYS), _INITIAL_CAPACITY), np.nan),
+        "length": 0,
+    })
+
+
+def _grow_values(st: dict, length: int, need: int):
+    """Ensure the series array holds *need* rows (doubling), keeping its first *length*; return it.
+
+    *length* is passed by the caller because st["length"] is only updated once a
+    whole batch has been parsed.
+    """
+    values = st["values"]
+    cap = values.shape[1]
+    if need > cap:
+        while cap < need:
+            cap *= 2
+        grown = np.full((len(SERIES_KEYS), cap), np.nan)
+        grown[:, :length] = values[:, :length]
+        values = st["values"] = grown
+    return values
+
+
+def _parse_cell(x: bytes) -> float:
+    x = x.strip()
+    if not x or x == b"-":
+        return float("nan")
     try:
-        return float(s)
+        return float(x)
     except ValueError:
+        return float("nan")
+
+
+def _parse_line(buf, pos: int, endpos: int) -> tuple[str, list[float]] | None:
+    """Parse the row in buf[pos:endpos] into (time, values in SERIES_KEYS order).
+
+    Only the matched fields are copied out of *buf*; the rest of the line is never decoded.
+    """
+    m = _LINE_RE.match(buf, pos, endpos)
+    if m is None:
         return None
+    row: list[float] = []
+    for group, width in zip(m.groups()[1:], _GROUP_WIDTHS):
+        cells = [_parse_cell(x) for x in group.replace(b",", b".").split(b"/")[:width]]
+        cells.extend([float("nan")] * (width - len(cells)))
+        row.extend(cells)
+    return m.group(1).decode("utf-8", errors="replace"), row
 
 
 def parse_polling_file(filepath: str):
-    """Parse live_odds_polling.txt; return (times, data_dict) or ([], {})."""
+    """Parse live_odds_polling.txt; return (times, data_dict) or ([], {}).
+
+    data_dict maps each of SERIES_KEYS to a float array (NaN where the cell was empty).
+    Only the tail appended since the previous call is mapped (mmap) and scanned in
+    place; rows accumulate in module state, and the returned list / array views share
+    that state (treat them as read-only). A trailing partial line is left for the next
+    call. If the file shrank (truncated or replaced) or a different path is passed,
+    parsing restarts from 0.
+    """
     if not os.path.isfile(filepath):
         return [], {}
-    times = []
-    out = {
-        "bf_back_a": [], "bf_lay_a": [], "bf_last_a": [],
-        "bf_back_b": [], "bf_lay_b": [], "bf_last_b": [],
-        "poly_bid_a": [], "poly_ask_a": [], "poly_lt_a": [], "poly_price_a": [],
-        "poly_bid_b": [], "poly_ask_b": [], "poly_lt_b": [], "poly_price_b": [],
-    }
-    with open(filepath, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("-") or "Betfair (back" in line:
-                continue
-            # Format: "14:23:59 | AUS BF: 62.1/61.7/61.7 | IND BF: 38.4/37.8/38.4 | AUS Poly: 59/60/41/62.5 | IND Poly: 40/41/41/37.5"
-            parts = [p.strip() for p in line.split("|")]
-            if len(parts) < 5:
-                continue
-            ist_str = parts[0]
-            times.append(ist_str)
-            # BF parts: "AUS BF: back/lay/last" and "IND BF: ..."
-            for i, key_pref in [(1, "bf"), (2, "bf")]:
-                pref = "a" if i == 1 else "b"
-                after_colon = parts[i].split(":", 1)[-1].strip() if ":" in parts[i] else ""
-                nums = [_parse_float(x) for x in after_colon.replace(",", ".").split("/")]
-                out[f"{key_pref}_back_{pref}"].append(nums[0] if len(nums) > 0 else None)
-                out[f"{key_pref}_lay_{pref}"].append(nums[1] if len(nums) > 1 else None)
-                out[f"{key_pref}_last_{pref}"].append(nums[2] if len(nums) > 2 else None)
-            # Poly: "AUS Poly: bid/ask/lt/price"
-            for i, pref in [(3, "a"), (4, "b")]:
-                after_colon = parts[i].split(":", 1)[-1].strip() if ":" in parts[i] else ""
-                nums = [_parse_float(x) for x in after_colon.replace(",", ".").split("/")]
-                out[f"poly_bid_{pref}"].append(nums[0] if len(nums) > 0 else None)
-                out[f"poly_ask_{pref}"].append(nums[1] if len(nums) > 1 else None)
-                out[f"poly_lt_{pref}"].append(nums[2] if len(nums) > 2 else None)
-                out[f"poly_price_{pref}"].append(nums[3] if len(nums) > 3 else None)
-    return times, out
+    st = _parse_state
+    size = os.path.getsize(filepath)
+    if st["path"] != filepath or size < st["offset"]:
+        _reset_parse_state(filepath)
+    start = st["offset"]
+    if size > start:
+        # mmap offsets must be a multiple of the allocation granularity.
+        base = start - start % mmap.ALLOCATIONGRANULARITY
+        with open(filepath, "rb") as f, mmap.mmap(
+            f.fileno(), size - base, access=mmap.ACCESS_READ, offset=base
+        ) as mm:
+            pos = start - base
+            end = mm.rfind(b"\n", pos) + 1
+            times = st["times"]
+            values = st["values"]
+            n = st["length"]
+            while 0 < end and pos < end:
+                nl = mm.find(b"\n", pos, end)
+                parsed = _parse_line(mm, pos, nl)
+                pos = nl + 1
+                if parsed is None:
+                    continue
+                if n == values.shape[1]:
+                    values = _grow_values(st, n, n + 1)
+                times.append(parsed[0])
+                values[:, n] = parsed[1]
+                n += 1
+            st["length"] = n
+            if end:
+                st["offset"] = base + end
+    values = st["values"][:, : st["length"]]
+    return st["times"], {k: values[i] for i, k in enumerate(SERIES_KEYS)}
+
+
+def parse_polling_bin(filepath: str):
+    """Binary counterpart of parse_polling_file for POLLING_BIN_FILE (same return value).
+
+    New whole records are read straight into the series array with numpy; no text is
+    parsed. Rows accumulate in the same module state as parse_polling_file.
+    """
+    if not os.path.isfile(filepath):
+        return [], {}
+    st = _parse_state
+    size = os.path.getsize(filepath)
+    if st["path"] != filepath or size < st["offset"]:
+        _reset_parse_state(filepath)
+    count = (size - st["offset"]) // _BIN_RECORD.size
+    if count:
+        recs = np.fromfile(filepath, dtype=_bin_dtype(), count=count, offset=st["offset"])
+        st["offset"] += count * _BIN_RECORD.size
+        n = st["length"]
+        values = _grow_values(st, n, n + count)
+        for i, k in enumerate(SERIES_KEYS):
+            values[i, n : n + count] = recs[k]
+        st["times"].extend(_ist_label(int(ts)) for ts in recs["ts"])
+        st["length"] = n + count
+    values = st["values"][:, : st["length"]]
+    return st["times"], {k: values[i] for i, k in enumerate(SERIES_KEYS)}
 
 
 def fetch_betfair_book():
@@ -140,83 +267,158 @@ def fetch_betfair_book():
     return result[0] if result else None
 
 
-def run_writer(team_a: str, team_b: str, sel_to_token: dict, selection_ids_ordered: list, stop: threading.Event):
-    """Background thread: fetch and append to POLLING_FILE."""
+def run_writer(team_a: str, team_b: str, sel_to_token: dict, selection_ids_ordered: list, stop: threading.Event, data_event: threading.Event | None = None):
+    """Background thread: fetch and append to POLLING_FILE.
+
+    The fetches run on an asyncio loop owned by this thread (matplotlib keeps the main
+    thread), so one thread drives all concurrent HTTP calls. *data_event*, if given, is
+    set after each row is written so the plot loop can refresh right away.
+    """
+    asyncio.run(_writer_task(team_a, team_b, sel_to_token, selection_ids_ordered, stop, data_event))
+
+
+async def _writer_task(team_a: str, team_b: str, sel_to_token: dict, selection_ids_ordered: list, stop: threading.Event, data_event: threading.Event | None):
     os.makedirs(DATA_DIR, exist_ok=True)
     header_line = f"IST     | {team_a} Betfair (back/lay/last)       | {team_b} Betfair (back/lay/last)      | {team_a} Poly (bid/ask/lt/price)           | {team_b} Poly (bid/ask/lt/price)"
-    sep_line = "-" * 130
-    if not os.path.exists(POLLING_FILE) or os.path.getsize(POLLING_FILE) == 0:
-        with open(POLLING_FILE, "a", encoding="utf-8") as f:
-            f.write(header_line + "\n")
-            f.write(sep_line + "\n")
+    # One handle for the thread's lifetime; line buffering hands each row to the OS
+    # (so the plot thread sees it), and fsync runs at most every FSYNC_INTERVAL.
+    fh = open(POLLING_FILE, "a", buffering=1, encoding="utf-8")
+    # Unbuffered: each record is one write(), so the plot thread never sees half a row.
+    fh_bin = open(POLLING_BIN_FILE, "ab", buffering=0)
+    try:
+        # Size of the file we actually opened (no separate exists/getsize race).
+        if os.fstat(fh.fileno()).st_size == 0:
+            fh.write(header_line + "\n")
+            fh.write(SEP_LINE + "\n")
+        # Drop a torn record left by a crash so later records stay aligned.
+        bin_size = os.fstat(fh_bin.fileno()).st_size
+        if bin_size % _BIN_RECORD.size:
+            os.ftruncate(fh_bin.fileno(), bin_size - bin_size % _BIN_RECORD.size)
+        async with make_poly_async_client() as client:
+            await _writer_loop(fh, fh_bin, client, team_a, team_b, sel_to_token, selection_ids_ordered, stop, data_event)
+    finally:
+        fh.flush()
+        os.fsync(fh.fileno())
+        fh.close()
+        os.fsync(fh_bin.fileno())
+        fh_bin.close()
+
+
+async def _fetch_poly(client, tids: tuple) -> tuple[dict, list]:
+    """All Polymarket books (one bulk /books call) and each token's prices-history (no batch
+    endpoint), issued together. A failed call yields {} / None for its part; the client's
+    own timeout is the only limit on how long they run.
+    """
+    results = await asyncio.gather(
+        afetch_poly_books(client, tids),
+        *(afetch_poly_prices(client, tid) for tid in tids),
+        return_exceptions=True,
+    )
+    books = {} if isinstance(results[0], BaseException) else results[0]
+    return books, [None if isinstance(r, BaseException) else r for r in results[1:]]
+
+
+async def _writer_loop(fh, fh_bin, client, team_a: str, team_b: str, sel_to_token: dict, selection_ids_ordered: list, stop: threading.Event, data_event: threading.Event | None):
+    """Fetch once per POLL_INTERVAL and append the row to *fh* (text) and *fh_bin* (binary) until *stop* is set."""
+    tids = tuple(sel_to_token[sid] for sid in selection_ids_ordered)
+    last_fsync = time.monotonic()
+    fmt = _fmt
+    fh_write = fh.write
+    bin_write = fh_bin.write
+    pack = _BIN_RECORD.pack
+    nan = float("nan")
+    # At most one Betfair fetch (on a worker thread) and one Polymarket round in flight.
+    # Neither is cancelled at the tick boundary: cancelling would lose a slow book and,
+    # for Polymarket, tear down the shared connection mid-handshake. A fetch that outlives
+    # its tick is carried over and used when it lands; until then rows repeat the last
+    # completed result.
+    no_poly = ({}, [None] * len(tids))
+    bf_task = poly_task = None
+    bf = None
+    poly_result = no_poly
     while not stop.is_set():
         t0 = time.perf_counter()
-        row_parts = [ist_now()]
-        bf = fetch_betfair_book()
+        ts = int(time.time())
+        ist = ist_now()
+        if bf_task is None:
+            bf_task = asyncio.ensure_future(asyncio.to_thread(fetch_betfair_book))
+        if poly_task is None:
+            poly_task = asyncio.ensure_future(_fetch_poly(client, tids))
+        # Independent sources, in flight together so a tick costs ~max RTT.
+        await asyncio.wait((bf_task, poly_task), timeout=POLL_INTERVAL)
+        if bf_task.done():
+            bf = bf_task.result() if bf_task.exception() is None else None
+            bf_task = None
+        if poly_task.done():
+            poly_result = poly_task.result() if poly_task.exception() is None else no_poly
+            poly_task = None
+        books_by_tid, prices = poly_result
+        books = [books_by_tid.get(tid) for tid in tids]
+        a_bf = b_bf = "-/-/-"
+        nums = [nan] * 6
         if bf:
-            probs = betfair_book_to_probs(bf)
-            for sid in selection_ids_ordered:
-                p = probs.get(sid) or {}
-                row_parts.append(_fmt(p.get("back_pct")))
-                row_parts.append(_fmt(p.get("lay_pct")))
-                row_parts.append(_fmt(p.get("last_pct")))
-        else:
-            for _ in selection_ids_ordered:
-                row_parts.extend(["", "", ""])
-        for tid in [sel_to_token[sid] for sid in selection_ids_ordered]:
+            (a_back, a_lay, a_last), (b_back, b_lay, b_last) = betfair_book_to_probs_ordered(
+                bf, selection_ids_ordered
+            )[:2]
+            a_bf = f"{fmt(a_back)}/{fmt(a_lay)}/{fmt(a_last)}"
+            b_bf = f"{fmt(b_back)}/{fmt(b_lay)}/{fmt(b_last)}"
+            nums = [nan if v is None else v for v in (a_back, a_lay, a_last, b_back, b_lay, b_last)]
+        poly = []
+        for book, prices_resp in zip(books, prices):
             try:
-                book = fetch_poly_book(tid)
                 bid, ask, lt = poly_book_to_probs(book)
-                row_parts.append(_fmt(bid * 100.0) if bid is not None else "")
-                row_parts.append(_fmt(ask * 100.0) if ask is not None else "")
-                row_parts.append(_fmt(lt * 100.0) if lt is not None else "")
-                pr = poly_prices_last(fetch_poly_prices(tid))
-                row_parts.append(_fmt(pr * 100.0) if pr is not None else "")
+                pr = poly_prices_last(prices_resp)
             except Exception:
-                row_parts.extend(["", "", "", ""])
-        if len(row_parts) >= 15:
-            ist, ab, al, alt, bb, bl, blt, a_pb, a_pa, a_plt, a_pr, b_pb, b_pa, b_plt, b_pr = row_parts[:15]
-            a_bf = f"{ab or '-'}/{al or '-'}/{alt or '-'}"
-            b_bf = f"{bb or '-'}/{bl or '-'}/{blt or '-'}"
-            a_poly = f"{a_pb or '-'}/{a_pa or '-'}/{a_plt or '-'}/{a_pr or '-'}"
-            b_poly = f"{b_pb or '-'}/{b_pa or '-'}/{b_plt or '-'}/{b_pr or '-'}"
-            visual = f"{ist} | {team_a} BF: {a_bf:28} | {team_b} BF: {b_bf:28} | {team_a} Poly: {a_poly:32} | {team_b} Poly: {b_poly}"
-        else:
-            visual = "\t".join(row_parts)
-        with open(POLLING_FILE, "a", encoding="utf-8") as f:
-            f.write(visual + "\n")
-            f.flush()
+                poly.append("-/-/-/-")
+                nums += (nan, nan, nan, nan)
+                continue
+            pcts = [nan if v is None else v * 100.0 for v in (bid, ask, lt, pr)]
+            nums += pcts
+            poly.append("/".join("-" if v != v else fmt(v) for v in pcts))
+        a_poly, b_poly = poly[:2]
+        visual = f"{ist} | {team_a} BF: {a_bf:28} | {team_b} BF: {b_bf:28} | {team_a} Poly: {a_poly:32} | {team_b} Poly: {b_poly}"
+        fh_write(visual + "\n")
+        bin_write(pack(ts, *nums[:14]))
+        if data_event is not None:
+            data_event.set()
+        now = time.monotonic()
+        if now - last_fsync >= FSYNC_INTERVAL:
+            os.fsync(fh.fileno())
+            os.fsync(fh_bin.fileno())
+            last_fsync = now
         print(visual)
         elapsed = time.perf_counter() - t0
         sleep = max(0.0, POLL_INTERVAL - elapsed)
         if sleep > 0 and not stop.is_set():
-            stop.wait(timeout=sleep)
-
-
-def _set_xticks_labels(ax, n: int, x: list):
-    xi = list(range(n))
-    if n <= 20:
-        ax.set_xticks(xi)
-        ax.set_xticklabels(x, rotation=45, ha="right", fontsize=9)
-    else:
-        step = max(1, n // 15)
-        ax.set_xticks(xi[::step])
-        ax.set_xticklabels([x[i] for i in range(0, n, step)], rotation=45, ha="right", fontsize=9)
+            await asyncio.sleep(sleep)
+    # Stopping: the client is about to close, so an unfinished Polymarket round is moot.
+    if poly_task is not None:
+        poly_task.cancel()
+
+
+def _set_xticks_labels(ax, n: int, x: list, tick_keys: dict | None = None):
+    """Set x ticks/labels for *n* points labelled by *x*.
+
+    With *tick_keys* (axes -> last tick layout), ticks and labels are only rebuilt when
+    the visible tick set changes; most refreshes then only move the x limit.
+    """
+    step = 1 if n <= 20 else max(1, n // 15)
+    key = (step, (n + step - 1) // step, x[0] if n else None)
+    if tick_keys is None or tick_keys.get(ax) != key:
+        ticks = range(0, n, step)
+        ax.set_xticks(ticks)
+        ax.set_xticklabels([x[i] for i in ticks], rotation=45, ha="right", fontsize=9)
+        if tick_keys is not None:
+            tick_keys[ax] = key
     ax.set_xlim(-0.5, n - 0.5)
 
 
-def _plot_series(ax, x, ya, yb, team_a: str, team_b: str, title: str, ylabel: str = "%"):
-    ax.clear()
+def _init_series(ax, team_a: str, team_b: str, title: str, ylabel: str = "%"):
+    """Set up a per-team chart once; return its (line_a, line_b) artists for _update_lines."""
     ax.set_title(title, fontsize=13)
     ax.set_ylabel(ylabel, fontsize=11)
-    n = len(x)
-    if n == 0:
-        return
-    xi = list(range(n))
-    if ya:
-        ax.plot(xi, ya, label=team_a, color="C0", alpha=0.9, linewidth=2)
-    if yb:
-        ax.plot(xi, yb, label=team_b, color="C1", alpha=0.9, linewidth=2)
+    (line_a,) = ax.plot([], [], label=team_a, color="C0", alpha=0.9, linewidth=2)
+    (line_b,) = ax.plot([], [], label=team_b, color="C1", alpha=0.9, linewidth=2)
     ax.legend(loc="upper right", fontsize=10)
     ax.set_ylim(0, 100)
     if MultipleLocator is not None:
@@ -224,21 +426,16 @@ def _plot_series(ax, x, ya, yb, team_a: str, team_b: str, title: str, ylabel: st
         ax.yaxis.set_minor_locator(MultipleLocator(1))
     ax.grid(True, alpha=0.3, which="both")
     ax.tick_params(axis="both", labelsize=10)
-    _set_xticks_labels(ax, n, x)
+    return line_a, line_b
 
 
-def _plot_arb_mm(ax, x, sum_asks, sum_bids):
+def _init_arb_mm(ax):
     """Single chart: Arb (ask sum) and MM (bid sum); Y from 0.70 to 1.30 with 0.01 grid."""
-    ax.clear()
     ax.set_title("Arb & MM: ask sum (arb < 1) · bid sum (MM > 1)", fontsize=13)
     ax.set_ylabel("Sum", fontsize=11)
-    n = len(x)
-    if n == 0:
-        return
-    xi = list(range(n))
     ax.axhline(1.0, color="gray", linestyle="--", alpha=0.8, linewidth=1.5)
-    ax.plot(xi, sum_asks, label="Arb (ask A+B)", color="C0", alpha=0.9, linewidth=2)
-    ax.plot(xi, sum_bids, label="MM (bid A+B)", color="C1", alpha=0.9, linewidth=2)
+    (line_asks,) = ax.plot([], [], label="Arb (ask A+B)", color="C0", alpha=0.9, linewidth=2)
+    (line_bids,) = ax.plot([], [], label="MM (bid A+B)", color="C1", alpha=0.9, linewidth=2)
     ax.legend(loc="upper right", fontsize=10)
     ax.set_ylim(0.70, 1.30)
     if MultipleLocator is not None:
@@ -246,9 +443,41 @@ def _plot_arb_mm(ax, x, sum_asks, sum_bids):
         ax.yaxis.set_minor_locator(MultipleLocator(0.01))
     ax.grid(True, alpha=0.3, which="both")
     ax.tick_params(axis="both", labelsize=10)
-    _set_xticks_labels(ax, n, x)
+    return line_asks, line_bids
+
+
+def _init_axes(ax_flat, team_a: str, team_b: str) -> list:
+    """Static setup of all 8 charts, done once; returns each chart's (line, line) pair."""
+    chart_lines = [
+        _init_series(ax_flat[i], team_a, team_b, CHART_TITLES[i]) for i in range(len(CHART_SERIES))
+    ]
+    chart_lines.append(_init_arb_mm(ax_flat[7]))
+    for ax in ax_flat:
+        # Limits are set explicitly; never rescale on set_data.
+        ax.set_autoscale_on(False)
+    return chart_lines
 
 
+def _update_lines(ax, lines, x, ya, yb, tick_keys: dict | None = None):
+    """Point the chart's persistent line artists at the current series."""
+    n = len(x)
+    xi = np.arange(n)
+    lines[0].set_data(xi, ya)
+    lines[1].set_data(xi, yb)
+    _set_xticks_labels(ax, n, x, tick_keys)
+
+
+# Series plotted on the seven per-team charts, in CHART_TITLES order.
+CHART_SERIES = (
+    ("bf_back_a", "bf_back_b"),
+    ("bf_lay_a", "bf_lay_b"),
+    ("bf_last_a", "bf_last_b"),
+    ("poly_bid_a", "poly_bid_b"),
+    ("poly_ask_a", "poly_ask_b"),
+    ("poly_lt_a", "poly_lt_b"),
+    ("poly_price_a", "poly_price_b"),
+)
+
 CHART_TITLES = [
     "1. Betfair back %",
     "2. Betfair lay %",
@@ -261,8 +490,14 @@ CHART_TITLES = [
 ]
 
 
-def run_plots(team_a: str, team_b: str, stop: threading.Event):
-    """Main thread: large 4×2 graphs, checkboxes 1–8 at top to show/hide charts."""
+def run_plots(team_a: str, team_b: str, stop: threading.Event, data_event: threading.Event | None = None, binary: bool = False):
+    """Main thread: large 4×2 graphs, checkboxes 1–8 at top to show/hide charts.
+
+    Between refreshes the GUI event loop is pumped every PLOT_IDLE_INTERVAL; a refresh
+    runs as soon as *data_event* is set by the writer, or after PLOT_REFRESH_INTERVAL
+    (for a writer in another process) if the file has grown. With *binary*, data is
+    read from POLLING_BIN_FILE (written by run_writer) instead of parsing POLLING_FILE.
+    """
     if not HAS_MATPLOTLIB or GridSpec is None or Rectangle is None:
         print("matplotlib not installed; run: pip install matplotlib", file=sys.stderr)
         return
@@ -295,12 +530,19 @@ def run_plots(team_a: str, team_b: str, stop: threading.Event):
             if 0.25 + i <= x < 0.75 + i:
                 chart_visible[i] = not chart_visible[i]
                 ax_flat[i].set_visible(chart_visible[i])
+                if not chart_visible[i]:
+                    # Hidden charts are not refreshed; drop their series so they do not
+                    # pin memory while hidden.
+                    for ln in chart_lines[i]:
+                        ln.set_data([], [])
+                elif latest[0] is not None:
+                    _update_chart(i, *latest[0])
                 update_checkbox_display()
                 break
 
     gs = GridSpec(4, 2, figure=fig, left=0.06, right=0.96, bottom=0.04, top=0.86, hspace=0.52, wspace=0.42)
     ax_flat = [fig.add_subplot(gs[r, c]) for r in range(4) for c in range(2)]
-    hover_data = [None, {}]
+    hover_times = [None]  # latest parsed times list (a reference, not a copy)
     ann = [None]
 
     def on_motion(event):
@@ -310,16 +552,14 @@ def run_plots(team_a: str, team_b: str, stop: threading.Event):
             ann[0].set_visible(False)
             fig.canvas.draw_idle()
             return
-        times_ref, data_ref = hover_data[0], hover_data[1]
-        if not times_ref or not data_ref:
+        times_ref = hover_times[0]
+        if not times_ref:
             return
         ax = event.inaxes
         try:
             ax_idx = ax_flat.index(ax)
         except ValueError:
             return
-        if ax_idx not in data_ref or not ax.lines:
-            return
         xdata = event.xdata
         if xdata is None:
             return
@@ -328,29 +568,27 @@ def run_plots(team_a: str, team_b: str, stop: threading.Event):
         if idx < 0 or idx >= n:
             return
         time_str = times_ref[idx]
-        # Find nearest line in y
-        best_line_i = 0
+        # Find nearest data line in y; ydata is read only from the hovered chart's lines.
+        lines = chart_lines[ax_idx]
+        best_line_i = None
         best_dist = float("inf")
-        for i, line in enumerate(ax.lines):
+        for i, line in enumerate(lines):
             if not line.get_visible():
                 continue
             yd = line.get_ydata()
             if idx >= len(yd):
                 continue
             yval = yd[idx]
-            if isinstance(yval, float) and (yval != yval):  # nan
+            if yval != yval:  # nan
                 continue
             d = abs(event.ydata - yval) if event.ydata is not None else 0
             if d < best_dist:
                 best_dist = d
                 best_line_i = i
-        if best_line_i >= len(ax.lines):
-            return
-        line = ax.lines[best_line_i]
-        yd = line.get_ydata()
-        if idx >= len(yd):
+        if best_line_i is None:
             return
-        yval = yd[idx]
+        line = lines[best_line_i]
+        yval = line.get_ydata()[idx]
         label = line.get_label() if line.get_label() else f"line {best_line_i}"
         ann[0].xy = (idx, yval)
         ann[0].xycoords = ax.transData
@@ -363,21 +601,28 @@ def run_plots(team_a: str, team_b: str, stop: threading.Event):
             ann[0].set_visible(False)
             fig.canvas.draw_idle()
 
-    leg_visibility = {}  # (ax_idx, line_idx) -> bool
+    # Line artists are created once and updated in place each refresh (no ax.clear()),
+    # so visibility toggled from the legend persists on the artists themselves.
+    chart_lines = _init_axes(ax_flat, team_a, team_b)
+    tick_keys = {}  # axes -> x tick layout last applied
+    legend_to_line = {}  # legend handle -> plotted line
+    for ax, lines in zip(ax_flat, chart_lines):
+        for leg_line, line in zip(ax.get_legend().get_lines(), lines):
+            leg_line.set_picker(8)
+            legend_to_line[leg_line] = line
 
     def on_pick(event):
-        if not hasattr(event.artist, "_toggle_idx"):
+        line = legend_to_line.get(event.artist)
+        if line is None:
             return
-        i, j = event.artist._toggle_idx
-        leg_visibility[(i, j)] = not leg_visibility.get((i, j), True)
-        event.artist.set_visible(leg_visibility[(i, j)])
-        if i < len(ax_flat) and j < len(ax_flat[i].lines):
-            ax_flat[i].lines[j].set_visible(leg_visibility[(i, j)])
+        vis = not line.get_visible()
+        line.set_visible(vis)
+        event.artist.set_visible(vis)
         fig.canvas.draw_idle()
 
     cid_click = fig.canvas.mpl_connect("button_press_event", on_click)
     cid_pick = fig.canvas.mpl_connect("pick_event", on_pick)
-    # Annotation on figure so it survives ax.clear() each refresh
+    # Annotation on the figure so it can move between axes
     if ax_flat:
         ann[0] = fig.annotate(
             "", xy=(0, 0), xycoords=ax_flat[0].transData,
@@ -397,61 +642,57 @@ def run_plots(team_a: str, team_b: str, stop: threading.Event):
     except Exception:
         pass
 
+    source, parse = (POLLING_BIN_FILE, parse_polling_bin) if binary else (POLLING_FILE, parse_polling_file)
+
+    latest = [None]  # (times, data) from the last refresh, for charts re-enabled later
+
+    def _update_chart(i, times, d):
+        if i < len(CHART_SERIES):
+            key_a, key_b = CHART_SERIES[i]
+            _update_lines(ax_flat[i], chart_lines[i], times, d[key_a], d[key_b], tick_keys)
+        else:
+            # NaN in either leg propagates, leaving a gap in the line.
+            sum_asks = (d["poly_ask_a"] + d["poly_ask_b"]) / 100.0
+            sum_bids = (d["poly_bid_a"] + d["poly_bid_b"]) / 100.0
+            _update_lines(ax_flat[i], chart_lines[i], times, sum_asks, sum_bids, tick_keys)
+
+    def _refresh():
+        times, d = parse(source)
+        if times:
+            latest[0] = (times, d)
+            for i in range(8):
+                if chart_visible[i]:
+                    _update_chart(i, times, d)
+            hover_times[0] = times
+        fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+
+    if data_event is None:
+        data_event = threading.Event()  # never set: refresh on the interval only
+    idle_ticks = max(1, round(PLOT_REFRESH_INTERVAL / PLOT_IDLE_INTERVAL))
+    last_size = None
     while not stop.is_set():
         try:
             if not plt.fignum_exists(fig.number):
                 break
         except Exception:
             break
-        times, d = parse_polling_file(POLLING_FILE)
-        n = len(times)
-        if n > 0:
-            _plot_series(ax_flat[0], times, d["bf_back_a"], d["bf_back_b"], team_a, team_b, CHART_TITLES[0])
-            _plot_series(ax_flat[1], times, d["bf_lay_a"], d["bf_lay_b"], team_a, team_b, CHART_TITLES[1])
-            _plot_series(ax_flat[2], times, d["bf_last_a"], d["bf_last_b"], team_a, team_b, CHART_TITLES[2])
-            _plot_series(ax_flat[3], times, d["poly_bid_a"], d["poly_bid_b"], team_a, team_b, CHART_TITLES[3])
-            _plot_series(ax_flat[4], times, d["poly_ask_a"], d["poly_ask_b"], team_a, team_b, CHART_TITLES[4])
-            _plot_series(ax_flat[5], times, d["poly_lt_a"], d["poly_lt_b"], team_a, team_b, CHART_TITLES[5])
-            _plot_series(ax_flat[6], times, d["poly_price_a"], d["poly_price_b"], team_a, team_b, CHART_TITLES[6])
-            sum_asks = []
-            for i in range(n):
-                a = d["poly_ask_a"][i] if i < len(d["poly_ask_a"]) else None
-                b = d["poly_ask_b"][i] if i < len(d["poly_ask_b"]) else None
-                if a is not None and b is not None:
-                    sum_asks.append((a + b) / 100.0)
-                else:
-                    sum_asks.append(float("nan"))
-            sum_bids = []
-            for i in range(n):
-                a = d["poly_bid_a"][i] if i < len(d["poly_bid_a"]) else None
-                b = d["poly_bid_b"][i] if i < len(d["poly_bid_b"]) else None
-                if a is not None and b is not None:
-                    sum_bids.append((a + b) / 100.0)
-                else:
-                    sum_bids.append(float("nan"))
-            _plot_arb_mm(ax_flat[7], times, sum_asks, sum_bids)
-
-            for i in range(8):
-                ax_flat[i].set_visible(chart_visible[i])
-
-            hover_data[0] = times
-            hover_data[1] = {i: [(ln.get_label(), list(ln.get_ydata())) for ln in ax_flat[i].lines] for i in range(8)}
-
-            for i, ax in enumerate(ax_flat):
-                if ax.get_legend() is None:
-                    continue
-                leg = ax.get_legend()
-                for j, leg_line in enumerate(leg.get_lines()):
-                    vis = leg_visibility.get((i, j), True)
-                    leg_line.set_visible(vis)
-                    leg_line.set_picker(8)
-                    leg_line._toggle_idx = (i, j)
-                    if j < len(ax.lines):
-                        ax.lines[j].set_visible(vis)
-
-        fig.canvas.draw_idle()
-        fig.canvas.flush_events()
-        plt.pause(PLOT_REFRESH_INTERVAL)
+        # Cleared before reading so a row written during the refresh re-arms it.
+        data_event.clear()
+        try:
+            size = os.path.getsize(source)
+        except OSError:
+            size = None
+        # Nothing new from the writer (or no file yet): skip parse + redraw.
+        if size != last_size:
+            last_size = size
+            _refresh()
+        # Keep the GUI (hover, clicks) responsive until the writer signals a new row.
+        # start_event_loop, unlike plt.pause, does not force a draw.
+        for _ in range(idle_ticks):
+            if data_event.is_set() or stop.is_set():
+                break
+            fig.canvas.start_event_loop(PLOT_IDLE_INTERVAL)
     for cid in (cid_click, cid_pick, cid_motion, cid_leave):
         try:
             fig.canvas.mpl_disconnect(cid)
@@ -464,25 +705,30 @@ def run_plots(team_a: str, team_b: str, stop: threading.Event):
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Live feed polling with plots")
+    parser.add_argument("--text", action="store_true",
+                        help=f"Plot by parsing {os.path.basename(POLLING_FILE)} instead of the binary sidecar")
+    args = parser.parse_args()
     token_map = get_token_map()
     market_ids = get_market_ids()
-    if not token_map or not market_ids:
-        print("Set BETFAIR_MARKET_IDS and TOKEN_MAP in .env", file=sys.stderr)
+    if len(token_map) < 2 or not market_ids:
+        print("Set BETFAIR_MARKET_IDS and TOKEN_MAP (both runners) in .env", file=sys.stderr)
         sys.exit(1)
     team_a, team_b = get_team_labels()
     sel_to_token = {sel_id: tid for tid, sel_id in token_map.items()}
     selection_ids_ordered = sorted(sel_to_token.keys())
     stop = threading.Event()
+    data_event = threading.Event()
     writer = threading.Thread(
         target=run_writer,
-        args=(team_a, team_b, sel_to_token, selection_ids_ordered, stop),
+        args=(team_a, team_b, sel_to_token, selection_ids_ordered, stop, data_event),
         daemon=True,
     )
     writer.start()
     print("Polling (writer) started →", POLLING_FILE)
     if HAS_MATPLOTLIB:
         try:
-            run_plots(team_a, team_b, stop)
+            run_plots(team_a, team_b, stop, data_event, binary=not args.text)
         except KeyboardInterrupt:
             pass
         finally:
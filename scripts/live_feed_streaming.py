@@ -7,28 +7,31 @@ Uses .env: BETFAIR_MARKET_IDS, TOKEN_MAP, TEAM_A, TEAM_B; Betfair streaming cred
 (USERNAME, PASSWORD, APP_KEY, CERTS or CERT_FILE).
 """
 
+import asyncio
 import os
 import queue
 import sys
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
 sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, SCRIPT_DIR)
 
-import dotenv
-dotenv.load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+import settings  # noqa: F401  (loads .env)
 
 from live_feed_common import (
+    afetch_poly_books,
+    afetch_poly_prices,
     betfair_odds_to_probs,
-    fetch_poly_book,
-    fetch_poly_prices,
     get_market_ids,
     get_team_labels,
     get_token_map,
     ist_now,
+    make_poly_async_client,
     poly_book_to_probs,
     poly_prices_last,
 )
@@ -36,60 +39,84 @@ from live_feed_common import (
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 STREAMING_FILE = os.path.join(DATA_DIR, "live_odds_streaming.txt")
 POLY_POLL_INTERVAL = 0.5
+WRITE_BATCH_MAX = 32
+FSYNC_INTERVAL = 0.5
+FSYNC_LINES = 16
+DROP_REPORT_INTERVAL = 60.0
+WRITER_STOP_TIMEOUT = 5.0
 
 
 def _fmt(x: float | None) -> str:
     if x is None:
         return ""
-    return f"{x:.4f}"
-
-
-def _build_visual(state: dict, lock: threading.Lock, selection_ids_ordered: list, team_a: str, team_b: str) -> str:
-    """Build one visual line from shared state (bf_probs, poly_parts)."""
-    with lock:
-        bf_probs = state.get("bf_probs") or {}
-        poly_parts = state.get("poly_parts") or [None] * 8
-    row = [ist_now()]
-    for sid in selection_ids_ordered:
-        p = bf_probs.get(sid) or {}
-        row.append(_fmt(p.get("back_pct")))
-        row.append(_fmt(p.get("lay_pct")))
-        row.append(_fmt(p.get("last_pct")))
-    for i in range(8):
-        v = poly_parts[i] if i < len(poly_parts) else None
-        row.append(_fmt(v))
-    if len(row) >= 15:
-        ist, ab, al, alt, bb, bl, blt, a_pb, a_pa, a_plt, a_pr, b_pb, b_pa, b_plt, b_pr = row[:15]
-        a_bf = f"{ab or '-'}/{al or '-'}/{alt or '-'}"
-        b_bf = f"{bb or '-'}/{bl or '-'}/{blt or '-'}"
-        a_poly = f"{a_pb or '-'}/{a_pa or '-'}/{a_plt or '-'}/{a_pr or '-'}"
-        b_poly = f"{b_pb or '-'}/{b_pa or '-'}/{b_plt or '-'}/{b_pr or '-'}"
-        return f"{ist} | {team_a} BF: {a_bf:28} | {team_b} BF: {b_bf:28} | {team_a} Poly: {a_poly:32} | {team_b} Poly: {b_poly}"
-    return "\t".join(str(x) for x in row)
-
-
-def _market_book_to_odds(market) -> dict:
-    """Convert betfairlightweight MarketBook to selection_id -> {back, lay, last_traded}."""
-    out = {}
-    for runner in getattr(market, "runners", []) or []:
+    return "%.4f" % x
+
+
+def _visual_template(team_a: str, team_b: str) -> str:
+    """%-template for one visual row; labels and widths are fixed for the run, so build it once."""
+    a = team_a.replace("%", "%%")
+    b = team_b.replace("%", "%%")
+    return f"%s | {a} BF: %-28s | {b} BF: %-28s | {a} Poly: %-32s | {b} Poly: %s"
+
+
+_NO_PROBS: dict = {}
+
+
+def _build_visual(state: dict, selection_ids_ordered: list, visual_fmt: str) -> str:
+    """Build one visual line from shared state (bf_probs, poly_parts) using *visual_fmt* from _visual_template."""
+    # No lock: each field has a single producer that never mutates a published value,
+    # it swaps in a new dict/tuple (one atomic store), so these reads see a whole snapshot.
+    bf_probs = state.get("bf_probs") or _NO_PROBS
+    poly_parts = state.get("poly_parts") or (None,) * 8
+    if len(selection_ids_ordered) < 2:
+        row = [ist_now()]
+        for sid in selection_ids_ordered:
+            p = bf_probs.get(sid) or _NO_PROBS
+            row.extend((_fmt(p.get("back_pct")), _fmt(p.get("lay_pct")), _fmt(p.get("last_pct"))))
+        row.extend(_fmt(v) for v in poly_parts)
+        return "\t".join(row)
+    fmt = _fmt
+    pa = bf_probs.get(selection_ids_ordered[0]) or _NO_PROBS
+    pb = bf_probs.get(selection_ids_ordered[1]) or _NO_PROBS
+    a_pb, a_pa, a_plt, a_pr, b_pb, b_pa, b_plt, b_pr = poly_parts[:8]
+    return visual_fmt % (
+        ist_now(),
+        f"{fmt(pa.get('back_pct')) or '-'}/{fmt(pa.get('lay_pct')) or '-'}/{fmt(pa.get('last_pct')) or '-'}",
+        f"{fmt(pb.get('back_pct')) or '-'}/{fmt(pb.get('lay_pct')) or '-'}/{fmt(pb.get('last_pct')) or '-'}",
+        f"{fmt(a_pb) or '-'}/{fmt(a_pa) or '-'}/{fmt(a_plt) or '-'}/{fmt(a_pr) or '-'}",
+        f"{fmt(b_pb) or '-'}/{fmt(b_pa) or '-'}/{fmt(b_plt) or '-'}/{fmt(b_pr) or '-'}",
+    )
+
+
+def _market_book_to_odds(market, out: dict | None = None) -> dict:
+    """Convert betfairlightweight MarketBook to selection_id -> {back, lay, last_traded}.
+
+    If *out* is given, its per-selection dicts are updated in place (runners not already
+    in it are added) so the steady-state stream path allocates nothing; the result is
+    only valid until the next call with the same *out*.
+    """
+    if out is None:
+        out = {}
+    seen = False
+    for runner in getattr(market, "runners", None) or ():
         sid = getattr(runner, "selection_id", None)
         if sid is None:
             continue
-        atb = getattr(runner, "available_to_back", None) or (
-            getattr(getattr(runner, "ex", None), "available_to_back", None)
-        )
-        atl = getattr(runner, "available_to_lay", None) or (
-            getattr(getattr(runner, "ex", None), "available_to_lay", None)
-        )
-        back = atb[0].price if atb and len(atb) > 0 else None
-        lay = atl[0].price if atl and len(atl) > 0 else None
-        last = getattr(runner, "last_price_traded", None)
-        out[sid] = {"back": back, "lay": lay, "last_traded": last}
-    return out
-
-
-def _make_listener_class(market_ids: list, selection_ids_ordered: list, team_a: str, team_b: str, state: dict, lock: threading.Lock, write_queue: queue.Queue):
-    """Build a StreamListener subclass that shares state and queue (library sets .stream on this instance)."""
+        ex = getattr(runner, "ex", None)
+        atb = getattr(runner, "available_to_back", None) or getattr(ex, "available_to_back", None)
+        atl = getattr(runner, "available_to_lay", None) or getattr(ex, "available_to_lay", None)
+        d = out.get(sid)
+        if d is None:
+            d = out[sid] = {}
+        d["back"] = atb[0].price if atb else None
+        d["lay"] = atl[0].price if atl else None
+        d["last_traded"] = getattr(runner, "last_price_traded", None)
+        seen = True
+    return out if seen else {}
+
+
+def _make_listener_class(market_ids: list, selection_ids_ordered: list, visual_fmt: str, state: dict, ring: deque, wake: threading.Event):
+    """Build a StreamListener subclass that shares state and the writer ring (library sets .stream on this instance)."""
     from betfairlightweight.streaming import StreamListener
 
     class LiveFeedStreamListener(StreamListener):
@@ -97,11 +124,12 @@ def _make_listener_class(market_ids: list, selection_ids_ordered: list, team_a:
             super().__init__(output_queue=queue.Queue(), max_latency=0.5, lightweight=False)
             self._market_ids = market_ids
             self._selection_ids_ordered = selection_ids_ordered
-            self._team_a = team_a
-            self._team_b = team_b
+            # Reused by _market_book_to_odds on every tick instead of fresh dicts per runner.
+            self._odds_out = {sid: {"back": None, "lay": None, "last_traded": None} for sid in selection_ids_ordered}
+            self._visual_fmt = visual_fmt
             self._state = state
-            self._lock = lock
-            self._write_queue = write_queue
+            self._ring = ring
+            self._wake = wake
 
         def on_data(self, raw_data: str):
             result = super().on_data(raw_data)
@@ -113,22 +141,26 @@ def _make_listener_class(market_ids: list, selection_ids_ordered: list, team_a:
                 market_books = self.stream.snap(self._market_ids)
                 if not market_books:
                     return None
+                # Hot path (runs per stream message): bind attributes once, not per market.
+                state = self._state
+                ring = self._ring
+                odds_out = self._odds_out
+                sids = self._selection_ids_ordered
+                visual_fmt = self._visual_fmt
                 for market in market_books:
                     if market is None:
                         continue
-                    odds = _market_book_to_odds(market)
+                    odds = _market_book_to_odds(market, odds_out)
                     if not odds:
                         continue
                     probs = betfair_odds_to_probs(odds)
-                    with self._lock:
-                        if "bf_probs" not in self._state:
-                            self._state["bf_probs"] = {}
-                        self._state["bf_probs"].update(probs)
-                    visual = _build_visual(self._state, self._lock, self._selection_ids_ordered, self._team_a, self._team_b)
-                    try:
-                        self._write_queue.put(("betfair", visual))
-                    except Exception:
-                        pass
+                    # Copy-on-write: build the merged dict, then publish it with one store.
+                    state["bf_probs"] = {**(state.get("bf_probs") or {}), **probs}
+                    visual = _build_visual(state, sids, visual_fmt)
+                    if ring:
+                        state["dropped_betfair"] += 1
+                    ring.append(visual)
+                    self._wake.set()
             except Exception:
                 pass
             return None
@@ -136,78 +168,161 @@ def _make_listener_class(market_ids: list, selection_ids_ordered: list, team_a:
     return LiveFeedStreamListener
 
 
-def run_poly_poll(state: dict, lock: threading.Lock, write_queue: queue.Queue, sel_to_token: dict, selection_ids_ordered: list, team_a: str, team_b: str):
-    """Poll Polymarket every POLY_POLL_INTERVAL and push ('polymarket', visual) to queue."""
-    while True:
+async def _poll_once(client, sel_to_token: dict, selection_ids_ordered: list) -> list:
+    """One Polymarket snapshot: (bid, ask, lt, price) x100 per selection, None where a fetch failed."""
+    tids = [sel_to_token.get(sid) for sid in selection_ids_ordered]
+    live = [tid for tid in tids if tid]
+    # All books in one bulk call plus every token's prices-history, in flight together,
+    # so a tick costs ~1 RTT instead of 2 per token.
+    results = await asyncio.gather(
+        afetch_poly_books(client, live),
+        *(afetch_poly_prices(client, tid) for tid in live),
+        return_exceptions=True,
+    )
+    books = results[0] if not isinstance(results[0], BaseException) else {}
+    prices = dict(zip(live, results[1:]))
+    parts = []
+    for tid in tids:
+        pr_resp = prices.get(tid)
+        if not tid or isinstance(pr_resp, BaseException):
+            parts.extend([None] * 4)
+            continue
         try:
-            parts = []
-            for sid in selection_ids_ordered:
-                tid = sel_to_token.get(sid)
-                if not tid:
-                    parts.extend([None] * 4)
-                    continue
-                try:
-                    book = fetch_poly_book(tid)
-                    bid, ask, lt = poly_book_to_probs(book)
-                    pr = poly_prices_last(fetch_poly_prices(tid))
-                    parts.append(bid * 100.0 if bid is not None else None)
-                    parts.append(ask * 100.0 if ask is not None else None)
-                    parts.append(lt * 100.0 if lt is not None else None)
-                    parts.append(pr * 100.0 if pr is not None else None)
-                except Exception:
-                    parts.extend([None] * 4)
-            with lock:
-                state["poly_parts"] = parts
-            visual = _build_visual(state, lock, selection_ids_ordered, team_a, team_b)
+            bid, ask, lt = poly_book_to_probs(books[tid])
+            pr = poly_prices_last(pr_resp)
+            parts.append(bid * 100.0 if bid is not None else None)
+            parts.append(ask * 100.0 if ask is not None else None)
+            parts.append(lt * 100.0 if lt is not None else None)
+            parts.append(pr * 100.0 if pr is not None else None)
+        except Exception:
+            parts.extend([None] * 4)
+    return parts
+
+
+async def _poly_poll_loop(state: dict, ring: deque, wake: threading.Event, sel_to_token: dict, selection_ids_ordered: list, visual_fmt: str):
+    # One client for the whole run so connections (and TLS sessions) are reused across ticks.
+    async with make_poly_async_client() as client:
+        loop = asyncio.get_running_loop()
+        # Fixed-rate schedule: tick k targets start + k * POLY_POLL_INTERVAL, so the period
+        # does not stretch by the fetch time. A poll is never cancelled (that would also
+        # drop its pooled connection): one that overruns is allowed to finish, the missed
+        # deadlines are dropped (not bursted) and the next poll starts right away.
+        next_deadline = loop.time()
+        while True:
+            next_deadline += POLY_POLL_INTERVAL
             try:
-                write_queue.put(("polymarket", visual))
+                parts = await _poll_once(client, sel_to_token, selection_ids_ordered)
+                state["poly_parts"] = tuple(parts)
+                visual = _build_visual(state, selection_ids_ordered, visual_fmt)
+                if ring:
+                    state["dropped_polymarket"] += 1
+                ring.append(visual)
+                wake.set()
             except Exception:
                 pass
-        except Exception:
-            pass
-        time.sleep(POLY_POLL_INTERVAL)
+            now = loop.time()
+            if now >= next_deadline:
+                next_deadline = now
+            else:
+                await asyncio.sleep(next_deadline - now)
+
 
+def run_poly_poll(state: dict, ring: deque, wake: threading.Event, sel_to_token: dict, selection_ids_ordered: list, visual_fmt: str):
+    """Poll Polymarket every POLY_POLL_INTERVAL and append each visual line to *ring*."""
+    asyncio.run(_poly_poll_loop(state, ring, wake, sel_to_token, selection_ids_ordered, visual_fmt))
 
-def run_writer(write_queue: queue.Queue, filepath: str, header_line: str, sep_line: str):
-    """Consume (source, line) from queue; write to file and print. Only handles source in ('betfair', 'polymarket')."""
+
+def _drain(bf_ring: deque, poly_ring: deque, limit: int) -> list[str]:
+    """Pop up to *limit* lines, oldest first from each ring (deque popleft is atomic under the GIL)."""
+    lines = []
+    for ring in (bf_ring, poly_ring):
+        while ring and len(lines) < limit:
+            lines.append(ring.popleft())
+    return lines
+
+
+def _write_lines(fd: int, lines: list[str]) -> None:
+    """Append *lines* with one syscall: plain write() for a single line, writev() for a batch."""
+    if len(lines) == 1:
+        os.write(fd, (lines[0] + "\n").encode("utf-8"))
+    else:
+        # Gather write: the kernel concatenates the buffers, no joined copy in Python.
+        os.writev(fd, [(line + "\n").encode("utf-8") for line in lines])
+
+
+def _report_dropped(state: dict, reported: tuple[int, int]) -> tuple[int, int]:
+    """Print the superseded-row counters to stderr if they moved since *reported*; return them."""
+    dropped = (state["dropped_betfair"], state["dropped_polymarket"])
+    if dropped != reported:
+        print(f"dropped (superseded) rows: betfair={dropped[0]} polymarket={dropped[1]}", file=sys.stderr)
+    return dropped
+
+
+def run_writer(bf_ring: deque, poly_ring: deque, wake: threading.Event, filepath: str, header_line: str, sep_line: str, stop: threading.Event | None = None, state: dict | None = None):
+    """Consume visual lines from the Betfair and Polymarket rings; write to file and print.
+
+    Producers append to their own ring and set *wake*; the writer only blocks on *wake*
+    when both rings are empty. Set *stop* (then *wake*) to flush, sync and return. With
+    *state*, its dropped_* counters are reported every DROP_REPORT_INTERVAL and on stop.
+    """
     os.makedirs(DATA_DIR, exist_ok=True)
-    # Write header once if file is missing or empty (open/close so it's committed)
-    if not os.path.exists(filepath) or os.path.getsize(filepath) == 0:
-        with open(filepath, "a", encoding="utf-8") as f:
-            f.write(header_line + "\n")
-            f.write(sep_line + "\n")
-            f.flush()
+    # One append-only fd for the whole run (no open/close per line).
+    fd = os.open(filepath, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    # Write header once if file is missing or empty
+    if os.fstat(fd).st_size == 0:
+        os.write(fd, (header_line + "\n" + sep_line + "\n").encode("utf-8"))
+    last_sync = time.monotonic()
+    unsynced = 0
+    last_report = last_sync
+    reported = (0, 0)
+    # Rows already taken from the rings whose write() failed (e.g. disk full).
+    lost = 0
+    try:
+        while True:
+            # Clear before draining: an append that lands after the drain sets it again,
+            # so the next wait() returns immediately rather than missing the line. While
+            # lines are unsynced, wake up by the group-commit deadline even if idle.
+            if unsynced:
+                wake.wait(max(last_sync + FSYNC_INTERVAL - time.monotonic(), 0.0))
+            else:
+                wake.wait()
+            wake.clear()
+            stopping = stop is not None and stop.is_set()
             try:
-                os.fsync(f.fileno())
-            except OSError:
-                pass
-    while True:
-        try:
-            item = write_queue.get()
-            if item is None:
-                break
-            source = str(item[0]) if isinstance(item, (tuple, list)) and len(item) >= 1 else None
-            if source not in ("betfair", "polymarket"):
-                continue
-            line = item[1] if isinstance(item, (tuple, list)) and len(item) >= 2 else str(item)
-            line = str(line)
-            wrote = False
-            try:
-                # Open, write one line, close so each line is committed to disk
-                with open(filepath, "a", encoding="utf-8") as f:
-                    f.write(line + "\n")
-                    f.flush()
+                # Take everything already queued (up to WRITE_BATCH_MAX per write) so a
+                # burst of updates costs one syscall instead of one each.
+                while lines := _drain(bf_ring, poly_ring, WRITE_BATCH_MAX):
+                    try:
+                        _write_lines(fd, lines)
+                    except OSError as e:
+                        lost += len(lines)
+                        print(f"write failed ({e}): lost rows={lost}", file=sys.stderr)
+                        continue
+                    unsynced += len(lines)
+                    for line in lines:
+                        print(line)
+                # Group commit: one fdatasync (appends need no metadata sync) covers every
+                # line written since the last one, issued once FSYNC_LINES have accumulated
+                # or the oldest is FSYNC_INTERVAL old.
+                now = time.monotonic()
+                if unsynced and (unsynced >= FSYNC_LINES or now - last_sync >= FSYNC_INTERVAL or stopping):
                     try:
-                        os.fsync(f.fileno())
+                        os.fdatasync(fd)
                     except OSError:
                         pass
-                wrote = True
+                    unsynced = 0
+                    last_sync = now
+                elif not unsynced:
+                    last_sync = now
+                if state is not None and (stopping or now - last_report >= DROP_REPORT_INTERVAL):
+                    reported = _report_dropped(state, reported)
+                    last_report = now
             except Exception:
                 pass
-            if wrote:
-                print(line)
-        except Exception:
-            pass
+            if stopping:
+                break
+    finally:
+        os.close(fd)
 
 
 def main():
@@ -224,31 +339,6 @@ def main():
         print("Set BETFAIR_USERNAME, BETFAIR_PASSWORD, BETFAIR_APP_KEY for streaming.", file=sys.stderr)
         sys.exit(1)
 
-    team_a, team_b = get_team_labels()
-    sel_to_token = {sel_id: tid for tid, sel_id in token_map.items()}
-    selection_ids_ordered = sorted(sel_to_token.keys())
-
-    header_line = f"IST     | {team_a} Betfair (back/lay/last)       | {team_b} Betfair (back/lay/last)      | {team_a} Poly (bid/ask/lt/price)           | {team_b} Poly (bid/ask/lt/price)"
-    sep_line = "-" * 130
-
-    state = {"bf_probs": {}, "poly_parts": [None] * 8}
-    lock = threading.Lock()
-    write_queue = queue.Queue()
-
-    writer = threading.Thread(target=run_writer, args=(write_queue, STREAMING_FILE, header_line, sep_line), daemon=True)
-    writer.start()
-
-    poly_thread = threading.Thread(
-        target=run_poly_poll,
-        args=(state, lock, write_queue, sel_to_token, selection_ids_ordered, team_a, team_b),
-        daemon=True,
-    )
-    poly_thread.start()
-
-    print("Streaming →", STREAMING_FILE)
-    print(header_line)
-    print(sep_line)
-
     import betfairlightweight
     from betfairlightweight import filters
 
@@ -260,27 +350,77 @@ def main():
     else:
         client_kw["certs"] = certs
 
+    # The login round trip only gates the stream: run it in the background while the
+    # writer and Polymarket poller start, and wait for it just before subscribing.
     trading = betfairlightweight.APIClient(**client_kw)
-    trading.login()
-
-    listener_class = _make_listener_class(
-        market_ids=market_ids,
-        selection_ids_ordered=selection_ids_ordered,
-        team_a=team_a,
-        team_b=team_b,
-        state=state,
-        lock=lock,
-        write_queue=write_queue,
-    )
-    listener = listener_class()
-    stream = trading.streaming.create_stream(listener=listener)
-    market_filter = filters.streaming_market_filter(market_ids=market_ids)
-    market_data_filter = filters.streaming_market_data_filter(
-        fields=["EX_BEST_OFFERS", "EX_MARKET_DEF", "EX_TRADED"],
-        ladder_levels=1,
+    login_pool = ThreadPoolExecutor(max_workers=1)
+    login_future = login_pool.submit(trading.login)
+
+    team_a, team_b = get_team_labels()
+    sel_to_token = {sel_id: tid for tid, sel_id in token_map.items()}
+    selection_ids_ordered = sorted(sel_to_token.keys())
+
+    header_line = f"IST     | {team_a} Betfair (back/lay/last)       | {team_b} Betfair (back/lay/last)      | {team_a} Poly (bid/ask/lt/price)           | {team_b} Poly (bid/ask/lt/price)"
+    sep_line = "-" * 130
+    visual_fmt = _visual_template(team_a, team_b)
+
+    # dropped_* count rows superseded before the writer got to them (one writer per key);
+    # the writer reports them to stderr.
+    state = {"bf_probs": {}, "poly_parts": (None,) * 8, "dropped_betfair": 0, "dropped_polymarket": 0}
+    # One latest-only slot per producer (single producer, single consumer each): each row
+    # is a full snapshot, so when the writer falls behind (e.g. a Betfair burst) appending
+    # evicts the stale row and only the newest state per source reaches the file.
+    bf_ring = deque(maxlen=1)
+    poly_ring = deque(maxlen=1)
+    wake = threading.Event()
+    # Set (then wake) when the stream ends, so the writer drains, syncs and closes its fd.
+    stop = threading.Event()
+
+    writer = threading.Thread(
+        target=run_writer,
+        args=(bf_ring, poly_ring, wake, STREAMING_FILE, header_line, sep_line),
+        kwargs={"stop": stop, "state": state},
+        daemon=True,
     )
-    stream.subscribe_to_markets(market_filter=market_filter, market_data_filter=market_data_filter)
-    stream.start()
+    writer.start()
+
+    try:
+        poly_thread = threading.Thread(
+            target=run_poly_poll,
+            args=(state, poly_ring, wake, sel_to_token, selection_ids_ordered, visual_fmt),
+            daemon=True,
+        )
+        poly_thread.start()
+
+        print("Streaming →", STREAMING_FILE)
+        print(header_line)
+        print(sep_line)
+
+        listener_class = _make_listener_class(
+            market_ids=market_ids,
+            selection_ids_ordered=selection_ids_ordered,
+            visual_fmt=visual_fmt,
+            state=state,
+            ring=bf_ring,
+            wake=wake,
+        )
+        listener = listener_class()
+        login_future.result()
+        login_pool.shutdown()
+        stream = trading.streaming.create_stream(listener=listener)
+        market_filter = filters.streaming_market_filter(market_ids=market_ids)
+        market_data_filter = filters.streaming_market_data_filter(
+            fields=["EX_BEST_OFFERS", "EX_MARKET_DEF", "EX_TRADED"],
+            ladder_levels=1,
+        )
+        stream.subscribe_to_markets(market_filter=market_filter, market_data_filter=market_data_filter)
+        stream.start()
+    finally:
+        # Ctrl-C, a login or stream failure: let the writer flush the rows still queued and
+        # fdatasync the group-commit tail before the process exits.
+        stop.set()
+        wake.set()
+        writer.join(WRITER_STOP_TIMEOUT)
 
 
 if __name__ == "__main__":
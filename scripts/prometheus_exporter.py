@@ -10,8 +10,15 @@ Usage:
 Grafana uses Prometheus as datasource; set panel axis to 1% step for % charts, 0.01 for Arb/MM.
 """
 
+import asyncio
+import functools
+import mmap
 import os
+import re
+import stat
 import sys
+import threading
+import time
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
@@ -19,16 +26,19 @@ sys.path.insert(0, PROJECT_ROOT)
 sys.path.insert(0, SCRIPT_DIR)
 
 try:
-    import dotenv
-    dotenv.load_dotenv(os.path.join(PROJECT_ROOT, ".env"))
+    import settings  # noqa: F401  (loads .env)
 except Exception:
     pass
 
+from live_feed_format import ROW_COLUMNS, ROW_GROUP_WIDTHS
+
 DATA_DIR = os.path.join(PROJECT_ROOT, "data")
 POLLING_FILE = os.path.join(DATA_DIR, "live_odds_polling.txt")
 DEFAULT_PORT = 9091
+WATCH_POLL_INTERVAL = 1.0
 
 
+@functools.lru_cache(maxsize=1)
 def _team_labels():
     """TEAM_A / TEAM_B from env; safe for Prometheus label (alphanumeric + underscore)."""
     a = (os.environ.get("TEAM_A") or "").strip() or "team_a"
@@ -38,6 +48,7 @@ def _team_labels():
     return safe(a), safe(b)
 
 
+@functools.lru_cache(maxsize=1)
 def _data_source() -> str:
     """DATA_SOURCE env: poll or stream (default poll)."""
     s = (os.environ.get("DATA_SOURCE") or "poll").strip().lower()
@@ -53,129 +64,289 @@ def _parse_float(s: str) -> float | None:
         return None
 
 
+# "IST | A BF: b/l/lt | B BF: b/l/lt | A Poly: b/a/lt/p | B Poly: b/a/lt/p": the four
+# number groups in one match. Lines it misses (e.g. a team label containing ":") are
+# split on "|" instead; either way the groups map onto ROW_COLUMNS.
+LINE_RE = re.compile(
+    r"^([^|]+)\|\s*[^:|]+:\s*([-\d.,/]+)\s*\|\s*[^:|]+:\s*([-\d.,/]+)\s*\|"
+    r"\s*[^:|]+:\s*([-\d.,/]+)\s*\|\s*[^:|]+:\s*([-\d.,/]+)"
+)
+
+
+def _group_nums(group: str, n: int) -> list[float | None]:
+    nums = [_parse_float(x) for x in group.replace(",", ".").split("/")[:n]]
+    return nums + [None] * (n - len(nums))
+
+
+def _parse_row(line: str) -> dict | None:
+    """Parse one polling-file line into gauge names -> float or None; None for header/separator lines."""
+    line = line.strip()
+    if not line or line.startswith("-") or "Betfair (back" in line:
+        return None
+    m = LINE_RE.match(line)
+    if m is not None:
+        groups = m.groups()[1:]
+    else:
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) < 5:
+            return None
+        groups = [p.split(":", 1)[-1].strip() if ":" in p else "" for p in parts[1:5]]
+    nums: list[float | None] = []
+    for group, width in zip(groups, ROW_GROUP_WIDTHS):
+        nums.extend(_group_nums(group, width))
+    return dict(zip(ROW_COLUMNS, nums))
+
+
+# filepath -> ((st_mtime_ns, st_size), row): an unchanged file is served without any I/O.
+_last_row_cache: dict[str, tuple[tuple[int, int], dict | None]] = {}
+
+
 def get_last_row(filepath: str) -> dict | None:
     """Parse last valid data row from polling file. Returns dict of gauge names -> float or None."""
-    if not os.path.isfile(filepath):
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    if not stat.S_ISREG(st.st_mode):
         return None
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _last_row_cache.get(filepath)
+    if cached is not None and cached[0] == key:
+        return cached[1]
     out = None
-    with open(filepath, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("-") or "Betfair (back" in line:
-                continue
-            parts = [p.strip() for p in line.split("|")]
-            if len(parts) < 5:
-                continue
-            # BF: back/lay/last for team A and B
-            def bf_nums(i):
-                after = parts[i].split(":", 1)[-1].strip() if ":" in parts[i] else ""
-                return [_parse_float(x) for x in after.replace(",", ".").split("/")]
-
-            def poly_nums(i):
-                after = parts[i].split(":", 1)[-1].strip() if ":" in parts[i] else ""
-                return [_parse_float(x) for x in after.replace(",", ".").split("/")]
-
-            na = bf_nums(1)
-            nb = bf_nums(2)
-            pa = poly_nums(3)
-            pb = poly_nums(4)
-            out = {
-                "bf_back_a": na[0] if len(na) > 0 else None,
-                "bf_lay_a": na[1] if len(na) > 1 else None,
-                "bf_last_a": na[2] if len(na) > 2 else None,
-                "bf_back_b": nb[0] if len(nb) > 0 else None,
-                "bf_lay_b": nb[1] if len(nb) > 1 else None,
-                "bf_last_b": nb[2] if len(nb) > 2 else None,
-                "poly_bid_a": pa[0] if len(pa) > 0 else None,
-                "poly_ask_a": pa[1] if len(pa) > 1 else None,
-                "poly_lt_a": pa[2] if len(pa) > 2 else None,
-                "poly_price_a": pa[3] if len(pa) > 3 else None,
-                "poly_bid_b": pb[0] if len(pb) > 0 else None,
-                "poly_ask_b": pb[1] if len(pb) > 1 else None,
-                "poly_lt_b": pb[2] if len(pb) > 2 else None,
-                "poly_price_b": pb[3] if len(pb) > 3 else None,
-            }
+    if st.st_size:
+        # The file is append-only and grows for hours: walk lines backwards from the end
+        # of a read-only mapping and stop at the first data row, instead of reading it all.
+        with open(filepath, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = len(mm)
+            while end > 0:
+                nl = mm.rfind(b"\n", 0, end)
+                out = _parse_row(mm[nl + 1 : end].decode("utf-8", errors="replace"))
+                if out is not None or nl < 0:
+                    break
+                end = nl
+    _last_row_cache[filepath] = (key, out)
     return out
 
 
+_PERCENT_HEADER = [
+    "# HELP live_odds_percent Live odds probability (0-100)",
+    "# TYPE live_odds_percent gauge",
+]
+_SUM_HEADER = [
+    "# HELP live_odds_sum Arb/MM sum (0-2, arb<1, mm>1)",
+    "# TYPE live_odds_sum gauge",
+]
+# Row key -> (source label, metric label, team side); replaces per-scrape string surgery on the key.
+METRIC_FOR_KEY = {
+    f"{prefix}_{metric}_{side}": (source, metric, side)
+    for prefix, source, metrics in (
+        ("bf", "betfair", ("back", "lay", "last")),
+        ("poly", "polymarket", ("bid", "ask", "lt", "price")),
+    )
+    for metric in metrics
+    for side in ("a", "b")
+}
+
+
+def _emit_last_row(filepath: str, on_row) -> None:
+    """on_row(get_last_row(filepath)); a failure (e.g. file mid-rotation) keeps the previous row."""
+    try:
+        on_row(get_last_row(filepath))
+    except Exception as e:
+        print(f"Could not read last row of {filepath}: {e!r}", file=sys.stderr)
+
+
+def watch_polling_file(filepath: str, on_row, poll_interval: float = WATCH_POLL_INTERVAL) -> None:
+    """Call on_row(get_last_row(filepath)) now and whenever the file changes; never returns.
+
+    Uses inotify (optional inotify_simple package) on the file's directory, so creation
+    and replacement are seen too; falls back to checking every *poll_interval* seconds,
+    which costs one stat() per check thanks to get_last_row's mtime/size cache.
+    """
+    _emit_last_row(filepath, on_row)
+    directory, name = os.path.split(filepath)
+    try:
+        from inotify_simple import INotify, flags
+
+        inotify = INotify()
+        inotify.add_watch(directory, flags.MODIFY | flags.CLOSE_WRITE | flags.CREATE | flags.MOVED_TO)
+    except (ImportError, OSError):
+        inotify = None
+    while True:
+        if inotify is None:
+            time.sleep(poll_interval)
+        # read_delay coalesces a burst of appends into one re-parse.
+        elif not any(e.name == name for e in inotify.read(read_delay=50)):
+            continue
+        _emit_last_row(filepath, on_row)
+
+
+@functools.lru_cache(maxsize=8)
+def _percent_prefixes(team_a: str, team_b: str, ds: str) -> dict[str, str]:
+    """Row key -> 'live_odds_percent{...} ' sample prefix; labels are fixed for a run, so built once."""
+    return {
+        key: f'live_odds_percent{{datasource="{ds}",source="{source}",metric="{metric}",team="{team_a if side == "a" else team_b}"}} '
+        for key, (source, metric, side) in METRIC_FOR_KEY.items()
+    }
+
+
 def metrics_text(data: dict | None, team_a: str = "team_a", team_b: str = "team_b", data_source: str = "poll") -> str:
     """Prometheus exposition format. team_a/team_b = legend names, data_source = poll or stream."""
     ds = data_source if data_source in ("poll", "stream") else "poll"
-    lines = [
-        "# HELP live_odds_percent Live odds probability (0-100)",
-        "# TYPE live_odds_percent gauge",
-    ]
+    lines = list(_PERCENT_HEADER)
     if not data:
         return "\n".join(lines) + "\n"
 
+    append = lines.append
+    prefixes = _percent_prefixes(team_a, team_b, ds)
     for key, val in data.items():
         if val is None:
             continue
-        team = team_a if key.endswith("_a") else team_b
-        if key.startswith("bf_"):
-            metric = key.replace("bf_", "").replace("_a", "").replace("_b", "")
-            lines.append(f'live_odds_percent{{datasource="{ds}",source="betfair",metric="{metric}",team="{team}"}} {val}')
-        elif key.startswith("poly_"):
-            metric = key.replace("poly_", "").replace("_a", "").replace("_b", "")
-            lines.append(f'live_odds_percent{{datasource="{ds}",source="polymarket",metric="{metric}",team="{team}"}} {val}')
-
-    lines.append("# HELP live_odds_sum Arb/MM sum (0-2, arb<1, mm>1)")
-    lines.append("# TYPE live_odds_sum gauge")
+        prefix = prefixes.get(key)
+        if prefix is not None:
+            append(prefix + str(val))
+
+    lines.extend(_SUM_HEADER)
     a_ask = data.get("poly_ask_a")
     b_ask = data.get("poly_ask_b")
     if a_ask is not None and b_ask is not None:
-        lines.append(f'live_odds_sum{{datasource="{ds}",series="arb_ask"}} {(a_ask + b_ask) / 100.0:f}')
+        append(f'live_odds_sum{{datasource="{ds}",series="arb_ask"}} {(a_ask + b_ask) / 100.0:f}')
     a_bid = data.get("poly_bid_a")
     b_bid = data.get("poly_bid_b")
     if a_bid is not None and b_bid is not None:
-        lines.append(f'live_odds_sum{{datasource="{ds}",series="mm_bid"}} {(a_bid + b_bid) / 100.0:f}')
+        append(f'live_odds_sum{{datasource="{ds}",series="mm_bid"}} {(a_bid + b_bid) / 100.0:f}')
 
     return "\n".join(lines) + "\n"
 
 
-def main():
+def _route(path: str, get_metrics) -> tuple[int, str, bytes]:
+    """(status, content type, body) for a GET of *path*."""
+    if path == "/metrics" or path == "/metrics/":
+        return 200, "text/plain; charset=utf-8", get_metrics()
+    if path == "/" or path == "/health":
+        return 200, "text/plain", b"OK\n"
+    return 404, "text/plain", b""
+
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    431: "Request Header Fields Too Large",
+}
+# Request bodies are never used; one up to this size is read and discarded so the next
+# keep-alive request stays in sync, anything larger (or chunked) closes the connection.
+_MAX_DISCARD_BODY = 64 * 1024
+
+
+class _BadRequest(Exception):
+    """Request that cannot be parsed; answered with *status*, then the connection is closed."""
+
+    def __init__(self, status: int):
+        super().__init__(status)
+        self.status = status
+
+
+async def _readline(reader) -> bytes:
     try:
-        from http.server import HTTPServer, BaseHTTPRequestHandler
-    except ImportError:
-        print("Python 3 required", file=sys.stderr)
-        sys.exit(1)
+        return await reader.readline()
+    except ValueError:  # line longer than the StreamReader limit
+        raise _BadRequest(431) from None
 
+
+async def _handle_http(reader, writer, get_metrics) -> None:
+    """Minimal HTTP/1.1 for the exporter: GET only, keep-alive unless the client asks to close."""
+    try:
+        while True:
+            request_line = ""
+            method = None
+            try:
+                request_line = (await _readline(reader)).decode("latin-1").strip()
+                if not request_line:
+                    break
+                keep_alive = request_line.endswith("HTTP/1.1")
+                content_length = 0
+                while (header := await _readline(reader)) not in (b"\r\n", b"\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    name = name.strip().lower()
+                    if name == "connection":
+                        keep_alive = value.strip().lower() != "close"
+                    elif name == "content-length":
+                        try:
+                            content_length = int(value)
+                        except ValueError:
+                            raise _BadRequest(400) from None
+                        if content_length < 0:
+                            raise _BadRequest(400)
+                    elif name == "transfer-encoding":
+                        # Chunked bodies are not parsed: reply, then close.
+                        keep_alive = False
+                if 0 < content_length <= _MAX_DISCARD_BODY:
+                    await reader.readexactly(content_length)
+                elif content_length:
+                    keep_alive = False
+                parts = request_line.split()
+                method = parts[0]
+                if len(parts) >= 2 and method in ("GET", "HEAD"):
+                    status, content_type, body = _route(parts[1], get_metrics)
+                else:
+                    status, content_type, body = 405, "text/plain", b""
+            except _BadRequest as e:
+                status, content_type, body = e.status, "text/plain", b""
+                keep_alive = False
+            head = (
+                f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+            ).encode("latin-1")
+            writer.write(head if method == "HEAD" else head + body)
+            await writer.drain()
+            print(f'"{request_line}" {status} -')
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve(port: int, get_metrics) -> None:
+    server = await asyncio.start_server(lambda r, w: _handle_http(r, w, get_metrics), port=port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
     port = int(os.environ.get("EXPORTER_PORT", DEFAULT_PORT))
     polling_file = os.environ.get("POLLING_FILE", POLLING_FILE)
     if not os.path.isabs(polling_file):
         polling_file = os.path.join(PROJECT_ROOT, polling_file)
+    # Labels and data source come from .env, loaded once at start-up.
+    team_a, team_b = _team_labels()
+    ds = _data_source()
+
+    # Exposition body for the last parsed row, rebuilt (and swapped in with a single
+    # assignment) by the watcher thread only when the file changes; every scrape just
+    # hands out the same bytes without touching the file or formatting anything.
+    latest = {"body": metrics_text(None, team_a=team_a, team_b=team_b, data_source=ds).encode("utf-8")}
+
+    def _set_row(row):
+        latest["body"] = metrics_text(row, team_a=team_a, team_b=team_b, data_source=ds).encode("utf-8")
+
+    threading.Thread(target=watch_polling_file, args=(polling_file, _set_row), daemon=True).start()
+
+    def get_metrics() -> bytes:
+        return latest["body"]
 
-    class Handler(BaseHTTPRequestHandler):
-        def do_GET(self):
-            if self.path == "/metrics" or self.path == "/metrics/":
-                data = get_last_row(polling_file)
-                team_a, team_b = _team_labels()
-                ds = _data_source()
-                body = metrics_text(data, team_a=team_a, team_b=team_b, data_source=ds).encode("utf-8")
-                self.send_response(200)
-                self.send_header("Content-Type", "text/plain; charset=utf-8")
-                self.send_header("Content-Length", str(len(body)))
-                self.end_headers()
-                self.wfile.write(body)
-            elif self.path == "/" or self.path == "/health":
-                self.send_response(200)
-                self.send_header("Content-Type", "text/plain")
-                self.end_headers()
-                self.wfile.write(b"OK\n")
-            else:
-                self.send_response(404)
-                self.end_headers()
-
-        def log_message(self, format, *args):
-            print(format % args)
-
-    server = HTTPServer(("", port), Handler)
+    # One asyncio loop serves every scrape (no thread or process per request).
     print(f"Prometheus exporter on http://0.0.0.0:{port}/metrics (reading {polling_file})")
     try:
-        server.serve_forever()
+        asyncio.run(_serve(port, get_metrics))
     except KeyboardInterrupt:
         print("\nShutting down")
-    server.server_close()
 
 
 if __name__ == "__main__":
@@ -14,11 +14,16 @@ Team A/B mapping:
   - TEAM_A and TEAM_B are display labels (from Betfair runner names); they do not change the mapping.
 """
 
+import functools
 import json
 import os
 import re
 import sys
 
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+
 # =============================================================================
 # CONFIG — set these, then run the script
 # =============================================================================
@@ -33,13 +38,47 @@ UPD_ENV = True
 TEAM_A_OVERRIDE = "WI"
 TEAM_B_OVERRIDE = "ZIM"
 
+# Opt-in fuzzy outcome/runner matching (needs `pip install rapidfuzz`) for names that
+# differ beyond substrings. Off by default: TOKEN_MAP drives trading, so review the
+# printed map when enabling it.
+FUZZY_MATCH = False
+
 # =============================================================================
 # Script (no need to edit below)
 # =============================================================================
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
-ENV_PATH = os.path.join(PROJECT_ROOT, ".env")
+sys.path.insert(0, PROJECT_ROOT)
+
+from settings import ENV_PATH
+
+# Betfair needs the project's connectors (and their deps); the Polymarket side and
+# the .env helpers work without them, so a failed import only surfaces when used.
+try:
+    from connectors.betfair.client import BetfairClient
+except ImportError as e:
+    BetfairClient = None
+    _BETFAIR_IMPORT_ERROR = e
+
+if FUZZY_MATCH:
+    from rapidfuzz import fuzz, process
+FUZZY_SCORE_CUTOFF = 75
+
+# Keep-alive session for Gamma API calls, so repeated event lookups reuse the TLS connection.
+_HTTP = requests.Session()
+_HTTP.headers.update({
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json",
+})
+_HTTP.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+
+# Trailing event id in a Betfair URL segment (e.g. ...-betting-35284617).
+_EVENT_ID_RE = re.compile(r"(\d{6,})$")
+# A .env assignment of one of the keys update_env_only manages (leading blanks allowed).
+_ENV_LINE_RE = re.compile(rb"^[ \t]*(BETFAIR_MARKET_IDS|TOKEN_MAP|TEAM_A|TEAM_B)=[^\r\n]*", re.M)
+# "Women" / "Women's" / standalone "W" in runner names, stripped for matching.
+_WOMEN_RE = re.compile(r"women\'?s?|\bw\b", re.I)
 
 
 def extract_betfair_event_id(url: str) -> str | None:
@@ -49,7 +88,7 @@ def extract_betfair_event_id(url: str) -> str | None:
     # Last path segment often ends with event id
     path = url.split("?")[0].rstrip("/")
     segment = path.split("/")[-1] if "/" in path else path
-    match = re.search(r"(\d{6,})$", segment)
+    match = _EVENT_ID_RE.search(segment)
     return match.group(1) if match else None
 
 
@@ -63,19 +102,11 @@ def extract_polymarket_slug(url: str) -> str | None:
 
 def fetch_polymarket_event(slug: str) -> dict | None:
     """Fetch event + markets from Gamma API. Returns first event or None."""
-    import urllib.request
-
     url = f"https://gamma-api.polymarket.com/events?slug={slug}"
-    req = urllib.request.Request(
-        url,
-        headers={
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "application/json",
-        },
-    )
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            data = json.loads(resp.read().decode())
+        resp = _HTTP.get(url, timeout=15)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
     except Exception as e:
         print("Polymarket fetch failed:", e, file=sys.stderr)
         return None
@@ -83,14 +114,17 @@ def fetch_polymarket_event(slug: str) -> dict | None:
     return events[0] if events else None
 
 
+@functools.lru_cache(maxsize=1)
+def _betfair_client():
+    """One BetfairClient (and its keep-alive session) shared by all market lookups."""
+    if BetfairClient is None:
+        raise _BETFAIR_IMPORT_ERROR
+    return BetfairClient()
+
+
 def fetch_betfair_market(event_id: str, market_type: str = "MATCH_ODDS"):
     """Get market ID and runners (selection_id -> name) from Betfair API."""
-    sys.path.insert(0, PROJECT_ROOT)
-    import dotenv
-    dotenv.load_dotenv(ENV_PATH)
-    from connectors.betfair.client import BetfairClient
-
-    client = BetfairClient()
+    client = _betfair_client()
     params = {
         "filter": {
             "eventIds": [event_id],
@@ -109,32 +143,51 @@ def fetch_betfair_market(event_id: str, market_type: str = "MATCH_ODDS"):
     return market_id, runners
 
 
+# Name normalisers are pure and see the same few team names repeatedly (token map,
+# then team labels), so they are memoised.
+@functools.lru_cache(maxsize=1024)
 def _norm(s: str) -> str:
     return (s or "").strip().lower().replace(" ", "")
 
 
-def _runner_norm_keys(name: str) -> list[str]:
+@functools.lru_cache(maxsize=1024)
+def _runner_norm_keys(name: str) -> tuple[str, ...]:
     """Normalized keys for matching: full norm and with 'women' / ' w' stripped."""
     n = _norm(name)
     if not n:
-        return []
-    keys = [n]
-    stripped = re.sub(r"women\'?s?|\bw\b", "", name, flags=re.I).strip()
+        return ()
+    stripped = _WOMEN_RE.sub("", name).strip()
     if stripped:
-        keys.append(_norm(stripped))
-    return keys
+        return (n, _norm(stripped))
+    return (n,)
+
+
+def _runner_name(runner: dict) -> str:
+    """Betfair runner display name (catalogue metadata first, then top-level runnerName)."""
+    metadata = runner.get("metadata")
+    return ((metadata and metadata.get("runnerName")) or runner.get("runnerName") or "").strip()
 
 
 def _moneyline_market(markets: list, event_slug: str) -> dict | None:
     """Pick the Moneyline (match winner) market, not Completed match or Toss."""
-    for m in markets:
-        slug = (m.get("slug") or "").strip()
-        mtype = (m.get("sportsMarketType") or "").strip().lower()
-        if mtype == "moneyline":
-            return m
-        if slug == event_slug and mtype != "cricket_completed_match" and "toss" not in slug:
-            return m
-    return markets[0] if markets else None
+    # Normalise each market's type/slug once; an explicit moneyline market wins over a
+    # slug match anywhere in the list, and each pass stops at its first hit.
+    fields = [
+        ((m.get("sportsMarketType") or "").strip().lower(), (m.get("slug") or "").strip(), m)
+        for m in markets
+    ]
+    return (
+        next((m for mtype, _, m in fields if mtype == "moneyline"), None)
+        or next(
+            (
+                m
+                for mtype, slug, m in fields
+                if slug == event_slug and mtype != "cricket_completed_match" and "toss" not in slug
+            ),
+            None,
+        )
+        or (markets[0] if markets else None)
+    )
 
 
 def build_token_map(polymarket_event: dict, betfair_runners: list) -> dict[str, int]:
@@ -157,24 +210,51 @@ def build_token_map(polymarket_event: dict, betfair_runners: list) -> dict[str,
     if len(outcomes) != len(token_ids):
         return {}
     outcome_to_token = {_norm(out): str(tid) for out, tid in zip(outcomes, token_ids)}
-    runner_norm_to_sel = {}
-    for r in betfair_runners:
-        name = ((r.get("metadata") or {}).get("runnerName") or r.get("runnerName") or "").strip()
-        if name:
-            for k in _runner_norm_keys(name):
-                runner_norm_to_sel[k] = r.get("selectionId")
+    runner_norm_to_sel = {
+        k: r.get("selectionId")
+        for r in betfair_runners
+        if (name := _runner_name(r))
+        for k in _runner_norm_keys(name)
+    }
     token_map = {}
     for out_norm, token_id in outcome_to_token.items():
-        if out_norm in runner_norm_to_sel:
-            token_map[token_id] = runner_norm_to_sel[out_norm]
-        else:
-            for run_norm, sel_id in runner_norm_to_sel.items():
-                if out_norm in run_norm or run_norm in out_norm:
-                    token_map[token_id] = sel_id
-                    break
+        sel_id = _match_runner(out_norm, runner_norm_to_sel)
+        if sel_id is not None:
+            token_map[token_id] = sel_id
+    # Each runner may back at most one outcome; anything else would quote one side
+    # against the other's prices.
+    tokens_by_sel: dict[int, list[str]] = {}
+    for token_id, sel_id in token_map.items():
+        tokens_by_sel.setdefault(sel_id, []).append(token_id)
+    shared = {sel_id: tids for sel_id, tids in tokens_by_sel.items() if len(tids) > 1}
+    if shared:
+        raise ValueError(f"several outcomes map to the same Betfair selection: {shared}")
     return token_map
 
 
+def _match_runner(out_norm: str, runner_norm_to_sel: dict[str, int]) -> int | None:
+    """
+    selectionId for one normalised outcome: exact name, else substring, else (with
+    FUZZY_MATCH) the best rapidfuzz score. Raises ValueError when a step matches
+    more than one runner equally well.
+    """
+    if not out_norm:
+        return None
+    if out_norm in runner_norm_to_sel:
+        return runner_norm_to_sel[out_norm]
+    hits = {sel_id for run_norm, sel_id in runner_norm_to_sel.items() if out_norm in run_norm or run_norm in out_norm}
+    if not hits and FUZZY_MATCH:
+        matches = process.extract(
+            out_norm, runner_norm_to_sel.keys(), scorer=fuzz.token_set_ratio, score_cutoff=FUZZY_SCORE_CUTOFF, limit=None
+        )
+        if matches:
+            best = max(score for _, score, _ in matches)
+            hits = {runner_norm_to_sel[name] for name, score, _ in matches if score == best}
+    if len(hits) > 1:
+        raise ValueError(f"outcome {out_norm!r} is ambiguous between selections {sorted(hits)}")
+    return hits.pop() if hits else None
+
+
 # Short codes for common cricket teams (Betfair runner name -> display label)
 TEAM_SHORT = {
     "south africa": "SA", "sri lanka": "SL", "england": "ENG", "india": "IND",
@@ -183,14 +263,18 @@ TEAM_SHORT = {
 }
 
 
+@functools.lru_cache(maxsize=1024)
 def _shorten_team(name: str) -> str:
     """Use short code if known, else first 3 chars of last word or full name."""
+    short = TEAM_SHORT.get(name)  # already-normalised names skip strip/lower
+    if short is not None:
+        return short
     n = (name or "").strip().lower()
     if n in TEAM_SHORT:
         return TEAM_SHORT[n]
-    words = n.split()
-    if words:
-        return words[-1][:3].upper() if len(words[-1]) >= 3 else n[:4].upper()
+    if n:
+        last = n.rsplit(None, 1)[-1]
+        return last[:3].upper() if len(last) >= 3 else n[:4].upper()
     return name[:4].upper() if name else "A"
 
 
@@ -199,20 +283,34 @@ def get_team_names_from_map(token_map: dict[str, int], betfair_runners: list) ->
     Derive TEAM_A and TEAM_B from token_map and Betfair runners.
     Order: by selection_id (asc). Lower selection_id = team A.
     """
-    sel_to_name = {}
-    for r in betfair_runners:
-        name = ((r.get("metadata") or {}).get("runnerName") or r.get("runnerName") or "").strip()
-        sid = r.get("selectionId")
-        if name and sid is not None:
-            sel_to_name[sid] = name
-    sel_ids_ordered = sorted(set(token_map.values()))
-    if len(sel_ids_ordered) < 2:
+    sel_to_name = {
+        sid: name
+        for r in betfair_runners
+        if (name := _runner_name(r)) and (sid := r.get("selectionId")) is not None
+    }
+    # Two smallest distinct selection ids in one pass (no set/sort of the whole map).
+    first = second = None
+    for sid in token_map.values():
+        if first is None or sid < first:
+            first, second = sid, first
+        elif sid != first and (second is None or sid < second):
+            second = sid
+    if second is None:
         return "team_a", "team_b"
-    a_name = sel_to_name.get(sel_ids_ordered[0], "team_a")
-    b_name = sel_to_name.get(sel_ids_ordered[1], "team_b")
+    a_name = sel_to_name.get(first, "team_a")
+    b_name = sel_to_name.get(second, "team_b")
     return _shorten_team(a_name), _shorten_team(b_name)
 
 
+def _write_env(data: bytes) -> None:
+    """Replace .env with *data* in a single write (bytes end to end, no text codec)."""
+    fd = os.open(ENV_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
 def update_env_only(betfair_market_ids: str, token_map_json: str, team_a: str = "", team_b: str = "") -> None:
     """Update BETFAIR_MARKET_IDS, TOKEN_MAP, TEAM_A, TEAM_B in .env; leave rest unchanged."""
     env_vars = [
@@ -221,35 +319,32 @@ def update_env_only(betfair_market_ids: str, token_map_json: str, team_a: str =
         ("TEAM_A", team_a or "team_a"),
         ("TEAM_B", team_b or "team_b"),
     ]
+    new_values = {k.encode(): v.encode("utf-8") for k, v in env_vars}
     if not os.path.exists(ENV_PATH):
-        with open(ENV_PATH, "w") as f:
-            for k, v in env_vars:
-                f.write(f"{k}={v}\n")
+        _write_env(b"".join(k + b"=" + v + b"\n" for k, v in new_values.items()))
         print("Created .env with BETFAIR_MARKET_IDS, TOKEN_MAP, TEAM_A, TEAM_B.")
         return
 
-    with open(ENV_PATH, "r") as f:
-        lines = f.readlines()
-
-    seen = {k: False for k, _ in env_vars}
-    new_lines = []
-    for line in lines:
-        matched = False
-        for k, v in env_vars:
-            if line.strip().startswith(f"{k}="):
-                new_lines.append(f"{k}={v}\n")
-                seen[k] = True
-                matched = True
-                break
-        if not matched:
-            new_lines.append(line)
-
-    for k, v in env_vars:
-        if not seen[k]:
-            new_lines.append(f"{k}={v}\n")
-
-    with open(ENV_PATH, "w") as f:
-        f.writelines(new_lines)
+    with open(ENV_PATH, "rb") as f:
+        data = f.read()
+
+    # One pass over the whole file: every assignment of a managed key is rewritten in
+    # place, everything else is left byte-for-byte; keys never seen are appended.
+    seen = set()
+
+    def _replace(m: re.Match) -> bytes:
+        key = m.group(1)
+        seen.add(key)
+        return key + b"=" + new_values[key]
+
+    data = _ENV_LINE_RE.sub(_replace, data)
+    missing = b"".join(k + b"=" + v + b"\n" for k, v in new_values.items() if k not in seen)
+    if missing:
+        if data and not data.endswith(b"\n"):
+            data += b"\n"
+        data += missing
+
+    _write_env(data)
     print("Updated .env (BETFAIR_MARKET_IDS, TOKEN_MAP, TEAM_A, TEAM_B).")
 
 
@@ -300,7 +395,11 @@ def main():
         print("No Betfair market or runners for this event.", file=sys.stderr)
         sys.exit(1)
 
-    token_map = build_token_map(event, runners)
+    try:
+        token_map = build_token_map(event, runners)
+    except ValueError as e:
+        print("Token map rejected:", e, file=sys.stderr)
+        sys.exit(1)
     if not token_map:
         print("Could not build token map (outcome names may not match).", file=sys.stderr)
         sys.exit(1)
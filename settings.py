@@ -1,9 +1,16 @@
+import functools
 import json
 import os
 
 import dotenv
 
-dotenv.load_dotenv()
+# .env loader for the app and connectors (main.py, connectors/*) and for the live-feed
+# scripts, the Prometheus exporter and resolve_market_from_urls, which import this module
+# instead of calling load_dotenv. The standalone cricket/capture scripts (dls_monitor,
+# dp_monitor, event_book_capture, cricket_match_lookup, live_capture) still load .env
+# themselves.
+ENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+dotenv.load_dotenv(ENV_PATH)
 
 BETFAIR_CONFIG = {
     "APP_KEY": os.environ.get("BETFAIR_APP_KEY"),
@@ -52,7 +59,11 @@ ODDSAPI_CONFIG = {"API_KEY": os.environ.get("ODDSAPI_API_KEY")}
 # Mapping: Polymarket token_id (str) → Betfair selectionId (int)
 # Set via TOKEN_MAP env var as a JSON object, e.g.:
 #   TOKEN_MAP='{"token_abc_yes": 12345, "token_abc_no": 12346}'
-TOKEN_MAP: dict[str, int] = json.loads(os.environ.get("TOKEN_MAP", "{}"))
+# Parsed on first use (cached), so tools that import settings without touching the
+# token map never pay for it. Treat the returned dict as read-only.
+@functools.lru_cache(maxsize=1)
+def token_map() -> dict[str, int]:
+    return json.loads(os.environ.get("TOKEN_MAP", "{}"))
 
 # RFQ system tunables — all overridable via environment variables
 RFQ_CONFIG = {
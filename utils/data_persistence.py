@@ -1,32 +1,43 @@
-import json
+import atexit
 import logging
+import weakref
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
 
-def _convert_datetime_to_iso(obj: Any) -> Any:
+# Odds are keyed by integer selection ID; datetimes anywhere in a record are written
+# as ISO 8601 by orjson itself.
+_ODDS_OPTS = orjson.OPT_NON_STR_KEYS
+_SNAPSHOT_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+
+
+def _iso(obj: Any) -> str:
     """
-    Recursively convert datetime objects to ISO format strings.
+    orjson ``default`` hook, called only for leaves it cannot encode natively.
     
-    Args:
-        obj: Object that may contain datetime objects
-        
-    Returns:
-        Object with datetime objects converted to ISO strings
+    Date/time-like objects orjson does not handle itself (e.g. datetime subclasses such
+    as pandas Timestamps) are written via their isoformat(); anything else is an error.
     """
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {key: _convert_datetime_to_iso(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_datetime_to_iso(item) for item in obj]
-    elif isinstance(obj, tuple):
-        return tuple(_convert_datetime_to_iso(item) for item in obj)
-    else:
-        return obj
+    isoformat = getattr(obj, "isoformat", None)
+    if isoformat is not None:
+        return isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Writers with an open file, closed (flushed) at interpreter exit. Weak references, so
+# registering for exit does not keep a discarded writer or its file alive.
+_open_writers: "weakref.WeakSet[PriceDataWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_writers() -> None:
+    for writer in list(_open_writers):
+        writer.close()
 
 
 class PriceDataWriter:
@@ -58,6 +69,14 @@ class PriceDataWriter:
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.current_file = self.data_dir / f"prices_{market_id}_{timestamp}.jsonl"
+        # Opened on first write and kept open until rotation/close(); _bytes tracks the
+        # file size so rotation checks need no stat() per update.
+        self._fh = None
+        self._bytes = 0
+        # Records have a fixed shape, so the JSON frame around the odds is kept as
+        # bytes; only the market_id part is re-encoded, and only when it changes.
+        self._frame_mid = None
+        self._frame_mid_bytes = None
         
         logger.info("Price data writer initialized: %s", self.current_file)
     
@@ -78,19 +97,24 @@ class PriceDataWriter:
         if timestamp is None:
             timestamp = datetime.now()
         
-        record = {
-            "timestamp": timestamp.isoformat(),
-            "market_id": market_id,
-            "odds": _convert_datetime_to_iso(odds),
-        }
-        
         try:
             if self._should_rotate():
                 self._rotate_file()
             
-            with open(self.current_file, "a", encoding="utf-8") as f:
-                json.dump(record, f, ensure_ascii=False)
-                f.write("\n")
+            if self._fh is None:
+                self._open()
+            if self._frame_mid_bytes is None or market_id != self._frame_mid:
+                self._frame_mid_bytes = b'","market_id":' + orjson.dumps(market_id) + b',"odds":'
+                self._frame_mid = market_id
+            # Same bytes (and key order) as dumping {"timestamp", "market_id", "odds"}.
+            line = b"".join((
+                b'{"timestamp":"',
+                timestamp.isoformat().encode(),
+                self._frame_mid_bytes,
+                orjson.dumps(odds, default=_iso, option=_ODDS_OPTS),
+                b"}\n",
+            ))
+            self._bytes += self._fh.write(line)
             
             self.write_count += 1
             
@@ -100,22 +124,39 @@ class PriceDataWriter:
         except Exception as e:
             logger.error("Error writing price data: %s", e, exc_info=True)
     
+    def _open(self) -> None:
+        """Open the current file for buffered binary appends."""
+        self._fh = open(self.current_file, "ab", buffering=1 << 16)
+        self._bytes = self._fh.tell()
+        _open_writers.add(self)
+    
     def _should_rotate(self) -> bool:
         """Check if file rotation is needed."""
-        if not self.current_file.exists():
+        if self._fh is None:
             return False
-        return self.current_file.stat().st_size >= self.max_file_size
+        return self._bytes >= self.max_file_size
     
     def _rotate_file(self) -> None:
         """Rotate to a new file."""
+        self.close()
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         old_file = self.current_file
         self.current_file = self.data_dir / f"prices_{self.market_id}_{timestamp}.jsonl"
         logger.info("Rotating data file: %s -> %s", old_file.name, self.current_file.name)
     
     def _flush(self) -> None:
-        """Flush any buffered data (handled by file system, but kept for future use)."""
-        pass
+        """Flush buffered records to the OS."""
+        if self._fh is not None:
+            self._fh.flush()
+    
+    def close(self) -> None:
+        """Flush and close the current file (reopened on the next write)."""
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+                _open_writers.discard(self)
     
     def write_snapshot(
         self,
@@ -143,12 +184,12 @@ class PriceDataWriter:
         snapshot = {
             "timestamp": datetime.now().isoformat(),
             "market_id": market_id,
-            "odds": _convert_datetime_to_iso(odds),
+            "odds": odds,
         }
         
         try:
-            with open(snapshot_file, "w", encoding="utf-8") as f:
-                json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            with open(snapshot_file, "wb") as f:
+                f.write(orjson.dumps(snapshot, default=_iso, option=_SNAPSHOT_OPTS))
             
             logger.info("Snapshot written: %s", snapshot_file)
             return snapshot_file
@@ -1,9 +1,34 @@
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from pathlib import Path
 from typing import Optional
 
+# The log format uses none of these record fields; skip gathering them (thread ident,
+# pid, multiprocessing and asyncio task lookups) for every record.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging.logAsyncioTasks = False
+
+# Background thread that owns the real (console + file) handlers; see setup_logging.
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """Drain queued records to the handlers, stop the listener thread and close its handlers."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
 
 def setup_logging(
     log_dir: str = "logs",
@@ -15,6 +40,10 @@ def setup_logging(
     """
     Set up logging configuration with both console and rotating file handlers.
     
+    Loggers only enqueue records (QueueHandler on the root logger); a QueueListener
+    thread formats them and does the console/file I/O, including rotation, so calling
+    threads never block on disk. Queued records are flushed at interpreter exit.
+    
     Args:
         log_dir: Directory to store log files
         log_file: Name of the log file
@@ -30,6 +59,7 @@ def setup_logging(
     root_logger = logging.getLogger()
     root_logger.setLevel(log_level)
     
+    _stop_listener()
     if root_logger.handlers:
         root_logger.handlers.clear()
     
@@ -41,7 +71,6 @@ def setup_logging(
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
     
     file_handler = logging.handlers.RotatingFileHandler(
         log_file_path,
@@ -51,6 +80,13 @@ def setup_logging(
     )
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+    
+    global _listener
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _listener.start()
     
     logging.info("Logging configured: console and file (%s)", log_file_path)